@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+"""converters_benchmark.py
+Times copying 10k Conferences and Sessions into their forms with the
+precompiled plans of converters.py against the field-by-field copy they
+replaced, and checks both give the same forms.
+
+Run from the repository root with the App Engine SDK importable, e.g.
+    PYTHONPATH=$GAE_SDK python benchmarks/converters_benchmark.py
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dev_appserver
+dev_appserver.fix_sys_path()
+
+from google.appengine.ext import ndb
+from google.appengine.ext import testbed
+
+from converters import copyToForm
+from models import Conference
+from models import ConferenceForm
+from models import Profile
+from models import Session
+from models import SessionForm
+from models import SessionType
+
+SESSION_TYPES = ('GENERAL', 'WORKSHOP', 'TUTORIAL', 'SEMINAR', 'FORUM')
+
+
+# The Conference copy converters.py replaced.
+def legacyConferenceToForm(conf):
+    cf = ConferenceForm()
+    for field in cf.all_fields():
+        if hasattr(conf, field.name):
+            if field.name.endswith('Date'):
+                setattr(cf, field.name, str(getattr(conf, field.name)))
+            else:
+                setattr(cf, field.name, getattr(conf, field.name))
+        elif field.name == "websafeKey":
+            setattr(cf, field.name, conf.key.urlsafe())
+    cf.check_initialized()
+    return cf
+
+
+# The Session copy converters.py replaced.
+def legacySessionToForm(session):
+    sf = SessionForm()
+    for field in sf.all_fields():
+        if hasattr(session, field.name):
+            if field.name == 'date' or field.name == 'startTime':
+                setattr(sf, field.name, str(getattr(session, field.name)))
+            elif field.name == 'typeOfSession':
+                setattr(sf, field.name,
+                        getattr(SessionType, getattr(session, field.name)))
+            else:
+                setattr(sf, field.name, getattr(session, field.name))
+    sf.check_initialized()
+    return sf
+
+
+def makeConferences(count):
+    organiser = ndb.Key(Profile, 'organiser')
+    start = datetime.date(2016, 1, 1)
+    return [Conference(
+        key=ndb.Key(Conference, i + 1, parent=organiser),
+        name='Conference %d' % i, description='About %d' % i,
+        organizerUserId='organiser', topics=['Topic %d' % (i % 7)],
+        city='City %d' % (i % 13),
+        startDate=start + datetime.timedelta(days=i % 365),
+        endDate=start + datetime.timedelta(days=i % 365 + 2),
+        month=(i % 12) + 1, maxAttendees=100, seatsAvailable=i % 100,
+        organizerDisplayName='Organiser')
+        for i in range(count)]
+
+
+def makeSessions(count):
+    c_key = ndb.Key(Profile, 'organiser', Conference, 1)
+    return [Session(
+        key=ndb.Key(Session, i + 1, parent=c_key),
+        name='Session %d' % i, highlights='Highlights %d' % i,
+        speakerKey=['speaker%d' % (i % 50)], duration=30 + i % 90,
+        typeOfSession=SESSION_TYPES[i % len(SESSION_TYPES)],
+        date=datetime.date(2016, 1, 1) + datetime.timedelta(days=i % 3),
+        month=1, startTime=datetime.time(8 + i % 10, i % 60),
+        parentKey=c_key.urlsafe())
+        for i in range(count)]
+
+
+# Returns the best time of a few runs of copying every entity.
+def best(copy, entities, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        for entity in entities:
+            copy(entity)
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--entities', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bed = testbed.Testbed()
+    bed.activate()
+    bed.init_datastore_v3_stub()
+    bed.init_memcache_stub()
+
+    status = 0
+    for kind, entities, legacy, form in (
+            ('Conference', makeConferences(args.entities),
+             legacyConferenceToForm, ConferenceForm),
+            ('Session', makeSessions(args.entities),
+             legacySessionToForm, SessionForm)):
+        # both copies give the same forms
+        if any(legacy(entity) != copyToForm(entity, form)
+               for entity in entities):
+            print('%s: forms differ' % kind)
+            status = 1
+        old = best(legacy, entities, args.repeat)
+        new = best(lambda entity: copyToForm(entity, form), entities,
+                   args.repeat)
+        print('%s x %d: field by field %.1f ms, plan %.1f ms (%.1fx)' % (
+            kind, len(entities), old * 1000, new * 1000, old / new))
+
+    bed.deactivate()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""metrics_benchmark.py
+Measures what metrics.recordMetrics adds to a representative endpoint,
+getConference, by timing it with metrics on and off: served from the
+response cache (where the overhead shows most) and built from the
+datastore.
+
+Run from the repository root with the App Engine SDK importable, e.g.
+    PYTHONPATH=$GAE_SDK python benchmarks/metrics_benchmark.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dev_appserver
+dev_appserver.fix_sys_path()
+
+from google.appengine.api import memcache
+from google.appengine.ext import ndb
+from google.appengine.ext import testbed
+
+import metrics
+from conference import ConferenceApi
+from conference import CONF_GET_REQUEST
+from models import Conference
+from models import Profile
+
+
+# Returns the mean seconds of a call to getConference, with the response
+# cache cleared before each call when cold.
+def timeCalls(api, request, calls, cold):
+    total = 0.0
+    for i in range(calls):
+        if cold:
+            memcache.flush_all()
+            ndb.get_context().clear_cache()
+        start = time.time()
+        api.getConference(request)
+        total += time.time() - start
+    return total / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--max-overhead', type=float, default=5.0,
+                        help='percent of a cold call allowed (default 5)')
+    args = parser.parse_args()
+
+    bed = testbed.Testbed()
+    bed.activate()
+    bed.init_datastore_v3_stub()
+    bed.init_memcache_stub()
+
+    organiser = ndb.Key(Profile, 'organiser@example.com')
+    c_key = Conference(key=ndb.Key(Conference, 1, parent=organiser),
+                       name='Benchmark', organizerUserId=organiser.id(),
+                       organizerDisplayName='Organiser', maxAttendees=10,
+                       seatsAvailable=10).put()
+    request = CONF_GET_REQUEST.combined_message_class(
+        websafeConferenceKey=c_key.urlsafe())
+    api = ConferenceApi()
+
+    status = 0
+    for label, cold in (('cached', False), ('cold', True)):
+        # alternate on and off, keeping the best round of each
+        off, on = [], []
+        for i in range(args.rounds):
+            metrics.ENABLED = False
+            off.append(timeCalls(api, request, args.calls, cold))
+            metrics.ENABLED = True
+            on.append(timeCalls(api, request, args.calls, cold))
+        off, on = min(off), min(on)
+        overhead = (on - off) / off * 100
+        print('%s getConference: off %.1f us, on %.1f us, '
+              'overhead %.1f us (%.1f%%)' % (
+                  label, off * 1e6, on * 1e6, (on - off) * 1e6, overhead))
+        if cold and overhead > args.max_overhead:
+            status = 1
+
+    bed.deactivate()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+"""registration_benchmark.py
+Drives hundreds of simultaneous registrations for one conference against
+the local datastore stub and reports throughput and any overbooking.
+
+Run from the repository root with the App Engine SDK importable, e.g.
+    PYTHONPATH=$GAE_SDK python benchmarks/registration_benchmark.py
+Pass --shards 1 to compare with a single seat counter.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dev_appserver
+dev_appserver.fix_sys_path()
+
+from google.appengine.datastore import datastore_stub_util
+from google.appengine.ext import ndb
+from google.appengine.ext import testbed
+
+from conference import ConferenceApi
+from models import ConflictException
+from models import Conference
+from models import Profile
+from models import Registration
+
+
+# Stores a conference with its SeatShards and the Profiles registering.
+def setUp(seats, shards, users):
+    organiser = ndb.Key(Profile, 'organiser')
+    c_key = ndb.Key(Conference, 1, parent=organiser)
+    ndb.put_multi(
+        [Conference(key=c_key, name='Benchmark', maxAttendees=seats,
+                    seatsAvailable=seats, seatShards=shards)] +
+        ConferenceApi._newSeatShards(c_key, shards, seats) +
+        [Profile(key=ndb.Key(Profile, 'user%d' % i),
+                 mainEmail='user%d@example.com' % i)
+         for i in range(users)])
+    return c_key
+
+
+# Registers the users taken from p_keys until none are left, counting the
+# outcomes.
+def register(api, p_keys, shard_keys, wsck, outcomes, lock):
+    # each thread has its own ndb context; skip its cache so shard reads
+    # see the other threads' writes
+    ndb.get_context().set_cache_policy(False)
+    while True:
+        with lock:
+            if not p_keys:
+                return
+            p_key = p_keys.pop()
+        try:
+            outcome = ('registered' if api._registerSeat(
+                p_key, shard_keys, wsck) else 'sold out')
+        except ConflictException:
+            outcome = 'busy'
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--seats', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=100)
+    parser.add_argument('--shards', type=int,
+                        help='SeatShards (default: as the app picks)')
+    args = parser.parse_args()
+
+    bed = testbed.Testbed()
+    bed.activate()
+    # every write is visible at once, as the transactions see it
+    bed.init_datastore_v3_stub(
+        consistency_policy=datastore_stub_util.PseudoRandomHRConsistencyPolicy(
+            probability=1))
+    bed.init_memcache_stub()
+
+    shards = args.shards or ConferenceApi._seatShardCount(args.seats)
+    c_key = setUp(args.seats, shards, args.users)
+    shard_keys = ConferenceApi._seatShardKeys(c_key, shards)
+    p_keys = [ndb.Key(Profile, 'user%d' % i) for i in range(args.users)]
+
+    api = ConferenceApi()
+    outcomes = {}
+    lock = threading.Lock()
+    threads = [threading.Thread(target=register, args=(
+        api, p_keys, shard_keys, c_key.urlsafe(), outcomes, lock))
+        for i in range(args.threads)]
+
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    registered = Registration.query().count()
+    left = [shard.seats for shard in ndb.get_multi(shard_keys)]
+    overbooked = max(0, registered - args.seats)
+
+    print('%d registrations, %d threads, %d seats over %d shards' % (
+        args.users, args.threads, args.seats, shards))
+    print('%.2fs, %.1f registrations/s' % (elapsed, args.users / elapsed))
+    for outcome in sorted(outcomes):
+        print('  %-10s %d' % (outcome, outcomes[outcome]))
+    print('registrations stored: %d, seats left: %d' % (
+        registered, sum(left)))
+    print('overbooked: %d, negative shards: %d, seats lost: %d' % (
+        overbooked, len([seats for seats in left if seats < 0]),
+        args.seats - registered - sum(left)))
+
+    bed.deactivate()
+    return 1 if overbooked or min(left) < 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
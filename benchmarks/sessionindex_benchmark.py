@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""sessionindex_benchmark.py
+Times building a SessionIndex over thousands of synthetic sessions and
+answering multi-range queries with it, against a linear scan, and checks
+both return the same sessions. Needs no App Engine SDK.
+
+Run from the repository root:
+    python benchmarks/sessionindex_benchmark.py
+"""
+
+import argparse
+import collections
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sessionindex import SessionIndex
+
+SESSION_TYPES = ('GENERAL', 'WORKSHOP', 'TUTORIAL', 'SEMINAR', 'FORUM')
+
+# Stands in for Session, with the properties the index reads
+FakeSession = collections.namedtuple(
+    'FakeSession', 'name startTime duration date typeOfSession')
+
+
+def makeSessions(count, rand):
+    first = datetime.date(2016, 1, 1)
+    return [FakeSession(
+        name='Session %d' % i,
+        startTime=datetime.time(rand.randint(8, 19), rand.choice((0, 30))),
+        duration=rand.choice((15, 30, 45, 60, 90, 120)),
+        date=first + datetime.timedelta(days=rand.randint(0, 4)),
+        typeOfSession=rand.choice(SESSION_TYPES))
+        for i in range(count)]
+
+
+# Returns random queries: a start time window, a duration range and a
+# date, with one session type excluded.
+def makeQueries(count, rand):
+    queries = []
+    for i in range(count):
+        start = rand.randint(8, 17)
+        low = rand.choice((15, 30, 45))
+        queries.append((
+            {'startTime': (datetime.time(start), datetime.time(start + 2)),
+             'duration': (low, low + 45),
+             'date': (datetime.date(2016, 1, 1 + rand.randint(0, 4)),) * 2},
+            [rand.choice(SESSION_TYPES)]))
+    return queries
+
+
+# The linear scan the index replaces, in the same listing order.
+def scan(index, ranges, excludeTypes):
+    return [session for session in index.sessions
+            if session.typeOfSession not in excludeTypes and all(
+                getattr(session, name) is not None and
+                low <= getattr(session, name) <= high
+                for name, (low, high) in ranges.items())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    sessions = makeSessions(args.sessions, rand)
+    queries = makeQueries(args.queries, rand)
+
+    start = time.time()
+    index = SessionIndex(sessions)
+    built = time.time() - start
+
+    start = time.time()
+    selected = [index.select(ranges, excluded) for ranges, excluded in queries]
+    indexed = time.time() - start
+
+    start = time.time()
+    scanned = [scan(index, ranges, excluded) for ranges, excluded in queries]
+    linear = time.time() - start
+
+    print('%d sessions: index built in %.1f ms' % (len(sessions),
+                                                   built * 1000))
+    print('%d queries: index %.3f ms/query, linear scan %.3f ms/query' % (
+        len(queries), indexed * 1000 / len(queries),
+        linear * 1000 / len(queries)))
+
+    if selected != scanned:
+        print('results differ from the linear scan')
+        return 1
+    print('results identical to the linear scan')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""cache.py
+Conference Central two-tier cache: a per-instance, in-process LRU in front
+of memcache for hot values read by many concurrent requests.
+"""
+
+import collections
+import hashlib
+import threading
+import time
+
+from protorpc import protojson
+from google.appengine.api import memcache
+
+# Most entries kept in the in-process cache of an instance
+LOCAL_CACHE_SIZE = 1000
+
+# Seconds an entry is served from the in-process cache before memcache is
+# asked again; bounds how stale one instance can be relative to memcache
+LOCAL_CACHE_TTL = 30
+
+
+class LruCache(object):
+    """LruCache -- thread-safe, size and TTL bounded LRU cache"""
+
+    def __init__(self, max_size=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value cached under key, or None."""
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None or item[1] < time.time():
+                self.misses += 1
+                return None
+            # re-insert as the most recently used entry
+            self._items[key] = item
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        """Cache value under key for ttl seconds (the cache's by default)."""
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (value, expires)
+            # evict the least recently used entries
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        """Drop key from the cache."""
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Return the hit and miss counters and the number of entries."""
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._items)}
+
+
+# The in-process tier, shared by every request thread of the instance
+LOCAL_CACHE = LruCache()
+
+
+# Gets a value from the in-process cache, falling back to memcache and
+# keeping what memcache returned for the next requests.
+def cacheGet(key):
+    value = LOCAL_CACHE.get(key)
+    if value is None:
+        value = memcache.get(key)
+        if value is not None:
+            LOCAL_CACHE.set(key, value)
+    return value
+
+
+# Sets a value in memcache (expiring after ttl seconds, 0 for never) and in
+# this instance's in-process cache; other instances pick it up within
+# LOCAL_CACHE_TTL seconds.
+def cacheSet(key, value, ttl=0):
+    memcache.set(key, value, time=ttl)
+    LOCAL_CACHE.set(key, value, min(ttl, LOCAL_CACHE.ttl) if ttl else None)
+
+
+# Deletes a value from memcache and from this instance's in-process cache.
+def cacheDelete(key):
+    memcache.delete(key)
+    LOCAL_CACHE.delete(key)
+
+
+# - - - Version-stamped responses - - - - - - - - - - - - - - - - - - - - - -
+
+# Memcache key of the generation of a namespace (e.g. one conference)
+GENERATION_KEY = 'GENERATION_%s'
+
+# Seconds a cached response is kept; it is unreachable as soon as the
+# generation it was stored under is bumped
+RESPONSE_CACHE_TTL = 3600
+
+# Response cache lookups of this instance, {response name: [hits, misses]}
+RESPONSE_CACHE_STATS = {}
+
+
+# Returns the current generation of a namespace. New (or evicted) counters
+# start at the current time in milliseconds, so a generation number that
+# responses were cached under is never handed out again.
+def getGeneration(name):
+    key = GENERATION_KEY % name
+    generation = memcache.get(key)
+    if generation is None:
+        memcache.add(key, int(time.time() * 1000))
+        generation = memcache.get(key)
+    return generation
+
+
+# Moves a namespace to its next generation, orphaning every response cached
+# under the previous one. Call it once the change has been committed.
+def bumpGeneration(name):
+    memcache.incr(GENERATION_KEY % name,
+                  initial_value=int(time.time() * 1000))
+
+
+# Returns the ProtoRPC message cached for a response of a namespace's
+# current generation, building and caching it with build() on a miss.
+def cachedResponse(name, response, message_type, build):
+    key = 'RESPONSE_%s_%s_%s' % (name, getGeneration(name), response)
+    # memcache keys are limited to 250 bytes
+    if len(key) > 250:
+        key = 'RESPONSE_%s' % hashlib.sha1(key).hexdigest()
+    stats = RESPONSE_CACHE_STATS.setdefault(response.split(':')[0], [0, 0])
+    encoded = memcache.get(key)
+    if encoded is not None:
+        stats[0] += 1
+        return protojson.decode_message(message_type, encoded)
+    stats[1] += 1
+    message = build()
+    memcache.set(key, protojson.encode_message(message),
+                 time=RESPONSE_CACHE_TTL)
+    return message
@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 
 from datetime import datetime
+import collections
+import json
+import random
+import time
 
 import endpoints
 from protorpc import messages
 from protorpc import message_types
 from protorpc import remote
 
+from google.appengine.api import datastore_errors
 from google.appengine.api import memcache
 from google.appengine.api import taskqueue
 from google.appengine.ext import ndb
@@ -19,24 +24,68 @@ from models import BooleanMessage
 from models import Conference
 from models import ConferenceForm
 from models import ConferenceForms
+from models import ConferenceSummaryForm
 from models import ConferenceQueryForms
+from models import SeatShard
+from models import AnnouncedConference
+from models import NearlySoldOut
+from models import NEARLY_SOLD_OUT_ID
+from models import Registration
+from models import RegistrationTicket
+from models import AttendeeForm
+from models import AttendeeForms
+from models import RegistrationForm
+from models import RegistrationStatus
 from models import Session
 from models import SessionForm
 from models import SessionForms
 from models import SessionType
+from models import SessionSchedule
+from models import SCHEDULE_ID
 from models import Speaker
 from models import SpeakerForm
 from models import SpeakerForms
+from models import BatchResultForm
+from models import BatchResultForms
+from models import SpeakerIndex
+from models import SpeakerSessionCount
+from models import SpeakerSessions
+from models import SPEAKER_SESSIONS_ID
+from models import WishlistEntry
+from models import FeaturedSpeaker
+from models import SPEAKER_INDEX_ID
 from models import TeeShirtSize
 from models import StringMessage
 
 from utils import getUserId
+from utils import getUserIdAsync
 from utils import getUser
 from utils import checkFieldValue
 from utils import checkField
 from utils import checkUsers
 from utils import checkObj
 from utils import getParentKey
+from utils import fetchPage
+from utils import fetchPageAsync
+from utils import MAX_PAGE_SIZE
+from utils import addTaskOncePerWindow
+from utils import TaskBatch
+
+from metrics import recordMetrics
+
+from cache import cacheGet
+from cache import cacheSet
+from cache import cachedResponse
+from cache import bumpGeneration
+from cache import getGeneration
+from cache import LOCAL_CACHE
+
+from converters import copyToForm
+
+from sessionindex import SessionIndex
+
+from mailer import queueEmail
+from mailer import emailInfo
 
 from settings import WEB_CLIENT_ID
 
@@ -57,7 +106,89 @@ API_EXPLORER_CLIENT_ID = endpoints.API_EXPLORER_CLIENT_ID
 
 # Memcache keys
 MEMCACHE_ANNOUNCEMENTS_KEY    = "RECENT_ANNOUNCEMENTS"
-MEMCACHE_FEATURED_SPEAKER_KEY = "FEATURED_SPEAKER"
+
+# Conferences with this many seats left, or fewer, are announced as nearly
+# sold out
+NEARLY_SOLD_OUT_SEATS = 5
+MEMCACHE_FEATURED_SPEAKER_KEY = "FEATURED_SPEAKER_%s"  # per conference
+
+# Cache generation of the responses about one conference
+CONFERENCE_GENERATION = "CONFERENCE_%s"
+
+# Cache generation of the responses about the conference catalog as a
+# whole, bumped by any conference write
+CATALOG_GENERATION = "CATALOG"
+
+# Speakers need this many sessions in a conference to be featured
+FEATURED_SPEAKER_MIN_SESSIONS = 2
+
+# Length of the featured speaker leaderboard
+FEATURED_SPEAKERS_SHOWN = 3
+
+# Seconds the empty featured speakers of a missing conference are cached
+FEATURED_SPEAKER_MISSING_TTL = 300
+
+# Conferences updated per batch when an organiser's name changes
+ORGANIZER_FANOUT_BATCH = 100
+
+# Upper bound on the number of SeatShards of a Conference
+SEAT_SHARDS = 20
+
+# Seconds between refreshes of Conference.seatsAvailable from its shards
+SEAT_SYNC_DELAY = 10
+
+# Pull queue holding the registrations of high demand conferences
+REGISTRATION_QUEUE = 'registrations'
+
+# Seconds a registration waits to be applied together with others
+REGISTRATION_BATCH_DELAY = 2
+
+# Queued registrations leased at a time, and for how many seconds
+REGISTRATION_LEASE_TASKS = 100
+REGISTRATION_LEASE_SECONDS = 60
+
+# Tickets applied per transaction
+REGISTRATION_TXN_SIZE = 20
+
+# Seconds a worker keeps leasing registrations before returning
+REGISTRATION_WORK_SECONDS = 30
+
+# Entity groups a cross-group transaction may touch
+MAX_XG_GROUPS = 25
+
+# In-process cache key of a conference's SessionIndex, by conference and
+# cache generation, and the seconds an instance keeps it
+SESSION_INDEX_KEY = "SESSION_INDEX_%s_%s"
+SESSION_INDEX_TTL = 600
+
+# Most items a bulk create endpoint accepts at once
+BATCH_CREATE_LIMIT = 500
+
+# Sessions of one conference stored per transaction by a bulk create,
+# and the most entities (sessions and their speakers' counters) a chunk
+# may write, well within MAX_COMMIT_ENTITIES
+SESSION_BATCH_TXN_SIZE = 100
+SESSION_BATCH_TXN_ENTITIES = 250
+
+# Entities one commit may write
+MAX_COMMIT_ENTITIES = 500
+
+# Most sessions, and encoded bytes of them, one SessionSchedule chunk
+# holds, well within the 1MB entity limit
+SCHEDULE_CHUNK_SIZE = 200
+SCHEDULE_CHUNK_BYTES = 900000
+
+# Profiles moved to WishlistEntry children per wishlist migration task
+WISHLIST_MIGRATION_BATCH = 50
+
+# Profiles whose registrations are moved to Registration children per
+# registration migration task
+REGISTRATION_MIGRATION_BATCH = 50
+
+# Conference properties read by summary listings; every query run with
+# this projection needs a matching composite index in index.yaml
+SUMMARY_PROPERTIES = ('name', 'city', 'startDate', 'endDate',
+                      'maxAttendees', 'seatsAvailable')
 
 # - - - FormField Constants/Default Values - - - - - - - - - - - - - - - - - -
 
@@ -67,6 +198,7 @@ CONFERENCE_DEFAULTS = {
     "maxAttendees": 0,
     "seatsAvailable": 0,
     "topics": ["Default", "Topic"],
+    "highDemand": False,
     }
 
 # Used with the Session Objects.
@@ -101,9 +233,21 @@ CONF_GET_REQUEST = endpoints.ResourceContainer(
 CONF_POST_REQUEST = endpoints.ResourceContainer(
     ConferenceForm, websafeConferenceKey=messages.StringField(1))
 
+CONF_CREATED_REQUEST = endpoints.ResourceContainer(
+    message_types.VoidMessage, summary=messages.BooleanField(1))
+
 CONF_GET_BY_DATE = endpoints.ResourceContainer(
     message_types.VoidMessage, date = messages.StringField(1))
 
+CONF_GET_BY_DATE_RANGE = endpoints.ResourceContainer(
+    message_types.VoidMessage,
+    fromDate  = messages.StringField(1, required=True),
+    toDate    = messages.StringField(2, required=True),
+    city      = messages.StringField(3),
+    topic     = messages.StringField(4),
+    pageSize  = messages.IntegerField(5),
+    pageToken = messages.StringField(6))
+
 #SESH_POST_REQUEST = endpoints.ResourceContainer(
  #   SessionForm, websafeConferenceKey=messages.StringField(1))
 
@@ -124,16 +268,41 @@ GET_SPEAKERS_BY_CONFERENCE = endpoints.ResourceContainer(
 SESH_BY_TIME_AND_TYPE_GET_REQUEST = endpoints.ResourceContainer(
     message_types.VoidMessage,
     websafeConferenceKey = messages.StringField(1, required=True),
-    noLaterThen          = messages.StringField(2, required=True),
-    typeOfSession        = messages.StringField(3, required=True))
+    noLaterThen          = messages.StringField(2),
+    excludeTypeOfSession = messages.StringField(3, repeated=True),
+    noEarlierThan        = messages.StringField(4),
+    minDuration          = messages.IntegerField(5),
+    maxDuration          = messages.IntegerField(6),
+    date                 = messages.StringField(7))
 
 SESSION_POST_REQUEST = endpoints.ResourceContainer(
     message_types.VoidMessage,
     webSafeSessionKey = messages.StringField(1, required=True))
 
+WISHLIST_GET_REQUEST = endpoints.ResourceContainer(
+    message_types.VoidMessage,
+    pageSize  = messages.IntegerField(1),
+    pageToken = messages.StringField(2))
+
+ATTENDEES_GET_REQUEST = endpoints.ResourceContainer(
+    message_types.VoidMessage,
+    websafeConferenceKey = messages.StringField(1, required=True),
+    pageSize             = messages.IntegerField(2),
+    pageToken            = messages.StringField(3))
+
+REGISTRATION_GET_REQUEST = endpoints.ResourceContainer(
+    message_types.VoidMessage,
+    websafeTicketKey = messages.StringField(1, required=True))
+
+SPEAKER_SESSIONS_GET_REQUEST = endpoints.ResourceContainer(
+    message_types.VoidMessage,
+    websafeSpeakerKey = messages.StringField(1, required=True),
+    pageSize          = messages.IntegerField(2),
+    pageToken         = messages.StringField(3))
+
 GET_FEATURED_SPEAKER = endpoints.ResourceContainer(
     message_types.VoidMessage,
-    webSafeSessionKey = messages.StringField(1, required=True))
+    websafeConferenceKey = messages.StringField(1, required=True))
 # - - - Conference API  - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 @endpoints.api(
@@ -148,42 +317,39 @@ class ConferenceApi(remote.Service):
 
     def _copyProfileToForm(self, prof):
         """Copy relevant fields from Profile to ProfileForm."""
-        
-        # copy relevant fields from Profile to ProfileForm
-        
-        pf = ProfileForm()
-        
-        for field in pf.all_fields():
-        
-            if hasattr(prof, field.name):
-        
-                # convert t-shirt string to Enum; just copy others
-                if field.name == 'teeShirtSize':
-        
-                    setattr(pf, field.name,
-                            getattr(TeeShirtSize, getattr(prof, field.name)))
-                else:
-                    setattr(pf, field.name, getattr(prof, field.name))
-        
-        pf.check_initialized()
-        
-        return pf
 
-    def _getProfileFromUser(self):
+        # t-shirt string is converted to Enum; others are just copied
+        form = copyToForm(prof, ProfileForm)
+
+        # registrations and the wishlist are kept as children of the
+        # Profile, both read at once
+        attending = self._attendingConferenceKeysAsync(prof)
+
+        wishlist = self._wishlistSessionKeysAsync(prof)
+
+        form.conferenceKeysToAttend = [
+            c_key.urlsafe() for c_key in attending.get_result()]
+
+        form.sessionWishList = wishlist.get_result()
+
+        return form
+
+    @ndb.tasklet
+    def _getProfileFromUserAsync(self):
         """Return user Profile from DataStore or create add new one if
-        non-existent."""
+        non-existent (tasklet)."""
 
         # Getting and Verifying current user
         user = getUser()
         
         # get the user_id (email) 
-        user_id = getUserId(user)
+        user_id = yield getUserIdAsync(user)
 
         # Creating a profile key. 
         p_key = ndb.Key(Profile, user_id)
         
         # Using the profile key to get a profile Object
-        profile = p_key.get()
+        profile = yield p_key.get_async()
 
         # create new Profile if not there
         if not profile:
@@ -194,9 +360,15 @@ class ConferenceApi(remote.Service):
                 mainEmail=user.email(),
                 teeShirtSize=str(TeeShirtSize.NOT_SPECIFIED),)
             
-            profile.put()
+            yield profile.put_async()
         
-        return profile 
+        raise ndb.Return(profile)
+
+    def _getProfileFromUser(self):
+        """Return user Profile from DataStore or create add new one if
+        non-existent."""
+
+        return self._getProfileFromUserAsync().get_result()
 
     def _doProfile(self, save_request=None):
         """Get user Profile and return to user, possibly updating it first."""
@@ -206,6 +378,8 @@ class ConferenceApi(remote.Service):
         
         # if saveProfile(), process user-modifiable fields
         if save_request:
+
+            displayName = prof.displayName
  
             for field in ('displayName', 'teeShirtSize'):
  
@@ -225,6 +399,13 @@ class ConferenceApi(remote.Service):
  
                             setattr(prof, field, val)
             prof.put()
+
+            # copy a new display name onto the user's conferences
+            if prof.displayName != displayName:
+
+                taskqueue.add(
+                    params = {'userId': prof.key.id()},
+                    url    = '/tasks/update_organizer_name')
         
         # return ProfileForm
         return self._copyProfileToForm(prof)
@@ -237,6 +418,7 @@ class ConferenceApi(remote.Service):
         path='profile',
         http_method='GET',
         name='getProfile')
+    @recordMetrics
     def getProfile(self, request):
         """Return user profile."""
         
@@ -248,6 +430,7 @@ class ConferenceApi(remote.Service):
         path='profile',
         http_method='POST',
         name='saveProfile')
+    @recordMetrics
     def saveProfile(self, request):
         """Update & return user profile."""
         
@@ -255,36 +438,38 @@ class ConferenceApi(remote.Service):
 
 # - - - Conference objects  - - - - - - - - - - - - - - - - - - - - - - - - -
 
-    def _copyConferenceToForm(self, conf, displayName):
+    def _copyConferenceToForm(self, conf, displayName=None):
         """Copy relevant fields from Conference to ConferenceForm."""
-        
-        cf = ConferenceForm()
-        
-        for field in cf.all_fields():
-        
-            if hasattr(conf, field.name):
-        
-                # convert Date to date string; just copy others
-                if field.name.endswith('Date'):
-        
-                    setattr(cf, field.name, str(getattr(conf, field.name)))
-        
-                else:
-        
-                    setattr(cf, field.name, getattr(conf, field.name))
-        
-            elif field.name == "websafeKey":
-        
-                setattr(cf, field.name, conf.key.urlsafe())
-        
+
+        # Dates are converted to date strings; others are just copied
+        cf = copyToForm(conf, ConferenceForm)
+
         if displayName:
-        
-            setattr(cf, 'organizerDisplayName', displayName)
-        
-        cf.check_initialized()
-        
+
+            cf.organizerDisplayName = displayName
+
         return cf
 
+    @ndb.tasklet
+    def _conferenceFormsAsync(self, conferences):
+        """Return ConferenceForms for conferences (tasklet)."""
+
+        # Conferences carry their organiser's display name; only those
+        # stored before it was copied onto them need the organiser's
+        # Profile, which is the conference's parent
+        organisers = yield ndb.get_multi_async(
+            list({conf.key.parent() for conf in conferences
+                  if conf.organizerDisplayName is None}))
+
+        # put display names in a dict for easier fetching
+        names = {prof.key.id(): prof.displayName
+                 for prof in organisers if prof}
+
+        raise ndb.Return(ConferenceForms(
+            items = [self._copyConferenceToForm(
+                conf, names.get(conf.organizerUserId))
+                for conf in conferences]))
+
     def _createConferenceObject(self, request):
         """Create a Conference object, returning ConferenceForm/request."""
         
@@ -294,6 +479,81 @@ class ConferenceApi(remote.Service):
         # get the user_id (email) 
         user_id = getUserId(user)
 
+        # check the form and turn it into Conference properties
+        data = self._conferenceData(
+            request, user_id, self._getProfileFromUser().displayName)
+
+        #---- Generate a Profile Key based on user ID and Conference ----
+        
+        # Profile key
+        p_key = ndb.Key(Profile, user_id)
+
+        # allocate new Conference ID with Profile key as parent
+        c_id  = Conference.allocate_ids(size=1, parent=p_key)[0]
+
+        # make Conference key using p_key and c_id 
+        data['key'] = ndb.Key(Conference, c_id, parent=p_key)
+
+        # email to organizer confirming creation of Conference
+        tasks = TaskBatch()
+
+        queueEmail(
+            tasks, user.email(), 'You Created a New Conference!',
+            'Here are the details for your conference:', emailInfo(request))
+
+        # create Conference; the email is only queued once it is stored
+        self._putConferenceEntities(self._newConferenceEntities(data))
+
+        tasks.flushAsync()
+
+        # cached conference queries may now be missing it
+        bumpGeneration(CATALOG_GENERATION)
+
+        tasks.wait()
+        
+        # return (modified) ConferenceForm
+        return request
+
+    def _putConferenceEntities(self, entities):
+        """Store new Conferences and their SeatShards. Those created with
+        few enough seats are added to the NearlySoldOut set as they are
+        stored, one transaction each."""
+
+        # every Conference is followed by its SeatShards
+        announced, others = [], []
+
+        for entity in entities:
+
+            if isinstance(entity, Conference):
+
+                group = []
+
+                (announced if self._isNearlySoldOut(entity)
+                 else others).append(group)
+
+            group.append(entity)
+
+        ndb.put_multi([entity for group in others for entity in group])
+
+        for group in announced:
+
+            self._putAnnouncedConference(group)
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _putAnnouncedConference(entities):
+        """Store a new Conference and its SeatShards, adding it to the
+        NearlySoldOut set in the same transaction."""
+
+        ndb.put_multi(entities)
+
+        ConferenceApi._updateNearlySoldOut(entities[0])
+
+    def _conferenceData(self, request, user_id, displayName):
+        """Check a ConferenceForm and return the properties of the new
+        Conference it describes, without its key; the defaults applied are
+        copied back onto the form."""
+
         # Checking if the name field is filled out. 
         checkFieldValue(request.name)
 
@@ -303,8 +563,10 @@ class ConferenceApi(remote.Service):
         
         # Getting deleted because they are not part of the ndb model
         del data['websafeKey']
-        
-        del data['organizerDisplayName']
+
+        # the organiser's name is stored with the conference
+        data['organizerDisplayName'] = request.organizerDisplayName = (
+            displayName)
         
         # add default values for those missing
         for df in CONFERENCE_DEFAULTS:
@@ -318,8 +580,8 @@ class ConferenceApi(remote.Service):
         # convert dates TO strings using the Date objects
         if data['startDate']:
             
-            data['startDate'] = datetime.strptime(
-                                    data['startDate'][:10], "%Y-%m-%d").date()
+            data['startDate'] = self._parseDate(
+                data['startDate'], 'startDate')
             
             data['month'] = data['startDate'].month
         
@@ -329,48 +591,28 @@ class ConferenceApi(remote.Service):
         
         if data['endDate']:
         
-            data['endDate'] = datetime.strptime(
-                data['endDate'][:10], "%Y-%m-%d").date()
+            data['endDate'] = self._parseDate(data['endDate'], 'endDate')
 
         # set seatsAvailable to be same as maxAttendees on creation
         if data["maxAttendees"] > 0:
         
             data["seatsAvailable"] = data["maxAttendees"]
 
-        #---- Generate a Profile Key based on user ID and Conference ----
-        
-        # Profile key
-        p_key = ndb.Key(Profile, user_id)
+        data['organizerUserId'] = request.organizerUserId = user_id
 
-        # allocate new Conference ID with Profile key as parent
-        c_id  = Conference.allocate_ids(size=1, parent=p_key)[0]
+        # spread the available seats over the Conference's SeatShards
+        data['seatShards'] = self._seatShardCount(data['seatsAvailable'])
 
-        # make Conference key using p_key and c_id 
-        c_key = ndb.Key(Conference, c_id, parent=p_key)
+        return data
 
-        # Update stored conference with profile and conference key
-        data['key'] = c_key
-        
-        data['organizerUserId'] = request.organizerUserId = user_id
-        
-        # create Conference, send email to organizer confirming
-        # creation of Conference & return (modified) ConferenceForm
-        Conference(**data).put()
-        
-        # cron job
-        taskqueue.add(
-            
-            params = {
-                'email'   : user.email(),
-                'subject' : 'You Created a New Conference!',
-                'body'    : 'Here are the details for your conference:',
-                'info'    : repr(request)},
-            
-            url    = '/tasks/send_confirmation_email')    
-        
-        return request
+    def _newConferenceEntities(self, data):
+        """Return a new Conference, from its properties and key, followed
+        by its SeatShards."""
 
-    @ndb.transactional()
+        return [Conference(**data)] + self._newSeatShards(
+            data['key'], data['seatShards'], data['seatsAvailable'])
+
+    @ndb.transactional(xg=True)
     def _updateConferenceObject(self, request):
         """Update a Conference object, returning the updated ConferenceForm().
         """
@@ -395,12 +637,21 @@ class ConferenceApi(remote.Service):
             raise endpoints.ForbiddenException(
                 'Only the owner can modify the Conference.')
 
+        # seatsAvailable follows maxAttendees and the registrations
+        if request.seatsAvailable not in (None, conf.seatsAvailable):
+            raise endpoints.BadRequestException(
+                'seatsAvailable can not be set, change maxAttendees instead.')
+
         # copy relevant fields from ConferenceForm to Conference object
         for field in request.all_fields():
             data = getattr(request, field.name)
 
-            # only copy fields where we get data
-            if data not in (None, []):
+            # only copy fields where we get data; seats are maintained on
+            # the Conference's SeatShards and the organiser's name from
+            # their Profile
+            if data not in (None, []) and field.name not in (
+                    'seatsAvailable', 'maxAttendees',
+                    'organizerDisplayName'):
                 
                 # special handling for dates (convert string to Date)
                 if field.name in ('startDate', 'endDate'):
@@ -413,12 +664,28 @@ class ConferenceApi(remote.Service):
                 
                 # write to Conference object
                 setattr(conf, field.name, data)
+
+        # a new maxAttendees gives seats to, or takes them from, the shards
+        if request.maxAttendees not in (None, conf.maxAttendees):
+            self._resizeSeats(conf, request.maxAttendees)
         
         conf.put()
+
+        # cached responses about the conference go stale once this commits
+        ndb.get_context().call_on_commit(
+            lambda: self._bumpConference(conf.key))
         
-        prof = ndb.Key(Profile, user_id).get()
-        
-        return self._copyConferenceToForm(conf, getattr(prof, 'displayName'))
+        return self._copyConferenceToForm(conf)
+
+    @staticmethod
+    def _bumpConference(c_key, catalog=True):
+        """Move the cached responses about a Conference, and unless told
+        otherwise those about the whole catalog, to a new generation."""
+
+        bumpGeneration(CONFERENCE_GENERATION % c_key.urlsafe())
+
+        if catalog:
+            bumpGeneration(CATALOG_GENERATION)
 
     def _getQuery(self, request):
         """Return formatted query from the submitted filters."""
@@ -440,10 +707,6 @@ class ConferenceApi(remote.Service):
         
         for filtr in filters:
 
-            if filtr["field"] in ["month", "maxAttendees"]:
-            
-                filtr["value"] = int(filtr["value"])
-            
             formatted_query = ndb.query.FilterNode(filtr["field"],
                                                    filtr["operator"],
                                                    filtr["value"])
@@ -473,6 +736,19 @@ class ConferenceApi(remote.Service):
             
                 raise endpoints.BadRequestException(
                     "Filter contains invalid field or operator.")
+
+            # numeric fields are compared as numbers
+            if filtr["field"] in ["month", "maxAttendees"]:
+
+                try:
+
+                    filtr["value"] = int(filtr["value"])
+
+                except (TypeError, ValueError):
+
+                    raise endpoints.BadRequestException(
+                        "Filter value must be a number for " +
+                        filtr["field"] + ".")
             
             # Every operation except "=" is an inequality
             if filtr["operator"] != "=":
@@ -493,6 +769,137 @@ class ConferenceApi(remote.Service):
         
         return (inequality_field, formatted_filters)
 
+    def _queryCacheKey(self, request):
+        """Return the canonical cache key of a conference query: the same
+        filters give the same key whatever their order or repetition."""
+
+        inequality_field, filters = self._formatFilters(request.filters)
+
+        filters = sorted({(filtr["field"], filtr["operator"], filtr["value"])
+                          for filtr in filters})
+
+        return 'queryConferences:%s' % json.dumps(
+            [filters, request.pageSize, request.pageToken,
+             bool(request.summary)])
+
+    def _summaryProjection(self, filters):
+        """Return the summary projection of a query and the values of the
+        properties it leaves out: those under an equality filter, which
+        a projection query may not return. Summaries take filters on one
+        field at most, the combinations index.yaml has an index for."""
+
+        if len({filtr["field"] for filtr in filters}) > 1:
+
+            raise endpoints.BadRequestException(
+                "Summary listings can filter on one field only; leave out "
+                "summary to combine filters.")
+
+        equal = {filtr["field"]: filtr["value"] for filtr in filters
+                 if filtr["operator"] == "="}
+
+        projection = [name for name in SUMMARY_PROPERTIES
+                      if name not in equal]
+
+        return projection, {name: value for name, value in equal.items()
+                            if name in SUMMARY_PROPERTIES}
+
+    def _copyConferenceToSummary(self, conf, overrides):
+        """Copy a (projected) Conference into a ConferenceSummaryForm."""
+
+        return copyToForm(conf, ConferenceSummaryForm, **overrides)
+
+    @staticmethod
+    def _updateOrganizerDisplayName(userId, pageToken=None):
+        """Copy an organiser's display name onto a batch of their
+        conferences, queueing the next batch until all are done."""
+
+        p_key = ndb.Key(Profile, userId)
+
+        prof = p_key.get()
+
+        if prof is None:
+            return
+
+        # the ancestor query is strongly consistent
+        conferences, nextPageToken = fetchPage(
+            Conference.query(ancestor=p_key), ORGANIZER_FANOUT_BATCH,
+            pageToken)
+
+        stale = [conf.key for conf in conferences
+                 if conf.organizerDisplayName != prof.displayName]
+
+        # the organiser's conferences share its entity group
+        if stale:
+
+            updated = ConferenceApi._setOrganizerDisplayName(
+                stale, prof.displayName)
+
+            for c_key in updated:
+                ConferenceApi._bumpConference(c_key)
+
+        if nextPageToken:
+
+            taskqueue.add(
+                params = {'userId': userId, 'pageToken': nextPageToken},
+                url    = '/tasks/update_organizer_name')
+
+    @staticmethod
+    @ndb.transactional()
+    def _setOrganizerDisplayName(c_keys, displayName, missingOnly=False):
+        """Set organizerDisplayName on Conferences of one organiser, read
+        again in the transaction so concurrent writes to them are kept.
+        With missingOnly, only Conferences stored without a name are set.
+        Returns the keys of the Conferences changed."""
+
+        conferences = [
+            conf for conf in ndb.get_multi(c_keys) if conf and (
+                conf.organizerDisplayName is None if missingOnly
+                else conf.organizerDisplayName != displayName)]
+
+        for conf in conferences:
+            conf.organizerDisplayName = displayName
+
+        ndb.put_multi(conferences)
+
+        return [conf.key for conf in conferences]
+
+    @staticmethod
+    def _backfillOrganizerDisplayNames(pageToken=None):
+        """Copy organisers' display names onto a batch of conferences
+        stored without one, queueing the next batch until all are done."""
+
+        conferences, nextPageToken = fetchPage(
+            Conference.query(), ORGANIZER_FANOUT_BATCH, pageToken)
+
+        stale = [conf for conf in conferences
+                 if conf.organizerDisplayName is None]
+
+        # the organiser Profiles are the conferences' parents
+        organisers = ndb.get_multi(
+            list({conf.key.parent() for conf in stale}))
+
+        names = {prof.key: prof.displayName for prof in organisers if prof}
+
+        # one transaction per organiser, their conferences' entity group
+        by_organiser = {}
+
+        for conf in stale:
+            by_organiser.setdefault(conf.key.parent(), []).append(conf.key)
+
+        for p_key, c_keys in by_organiser.items():
+
+            updated = ConferenceApi._setOrganizerDisplayName(
+                c_keys, names.get(p_key, ''), missingOnly=True)
+
+            for c_key in updated:
+                ConferenceApi._bumpConference(c_key)
+
+        if nextPageToken:
+
+            taskqueue.add(
+                params = {'pageToken': nextPageToken},
+                url    = '/tasks/backfill_organizer_names')
+
 # - - - Endpoints Methods (Conference)  - - - - - - - - - - - - - - - - - - -
 
     @endpoints.method(
@@ -501,28 +908,40 @@ class ConferenceApi(remote.Service):
         path='conference',
         http_method='POST',
         name='createConference')
+    @recordMetrics
     def createConference(self, request):
         """Create new conference."""
         return self._createConferenceObject(request)
 
+    @ndb.tasklet
+    def _getConferenceAsync(self, c_key):
+        """Return the ConferenceForm of a Conference key (tasklet)."""
+
+        conf = yield c_key.get_async()
+
+        checkObj(conf, 'Conference')
+
+        forms = yield self._conferenceFormsAsync([conf])
+
+        raise ndb.Return(forms.items[0])
+
     @endpoints.method(
         CONF_GET_REQUEST,
         ConferenceForm,
         path='conference/{websafeConferenceKey}',
         http_method='GET',
         name='getConference')
+    @recordMetrics
     def getConference(self, request):
         """Return requested conference (by websafeConferenceKey)."""
 
-        # get Conference object from request; bail if not found
-        conf = ndb.Key(urlsafe=request.websafeConferenceKey).get()
-        
-        checkObj(conf, 'Conference')
+        c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
 
-        prof = conf.key.parent().get()
-        
-        # return ConferenceForm
-        return self._copyConferenceToForm(conf, getattr(prof, 'displayName'))
+        # return ConferenceForm, cached until the conference changes
+        return cachedResponse(
+            CONFERENCE_GENERATION % c_key.urlsafe(), 'getConference',
+            ConferenceForm,
+            lambda: self._getConferenceAsync(c_key).get_result())
 
     @endpoints.method(
         ConferenceQueryForms,
@@ -530,37 +949,70 @@ class ConferenceApi(remote.Service):
         path='queryConferences',
         http_method='POST',
         name='queryConferences')
+    @recordMetrics
     def queryConferences(self, request):
-        """Query for conferences."""
-        
-        conferences = self._getQuery(request)
-        
-        # get the organizers display name
-        organisers = ([(ndb.Key(Profile, conf.organizerUserId)) for conf in
-                      conferences])
-        
-        # get_multi is a model hook, uses memcache
-        profiles = ndb.get_multi(organisers)
-        
-        # put display names in a dict for easier fetching
-        names = {}
-        
-        for profile in profiles:
-            names[profile.key.id()] = profile.displayName
+        """Query for conferences, one page at a time when pageSize is given.
+        """
 
-        # return individual ConferenceForm object per Conference
-        return ConferenceForms(
-            items = [self._copyConferenceToForm(
-                conf, names[conf.organizerUserId]) for conf in conferences])
+        # repeated queries are served from the cache until a conference
+        # changes anywhere in the catalog
+        return cachedResponse(
+            CATALOG_GENERATION, self._queryCacheKey(request), ConferenceForms,
+            lambda: self._queryConferencesAsync(request).get_result())
+
+    @ndb.tasklet
+    def _queryConferencesAsync(self, request):
+        """Run the conference query once and build its forms (tasklet)."""
+
+        query = self._getQuery(request)
+
+        options = {}
+
+        overrides = {}
+
+        # summaries only read the listed properties, from the index
+        if request.summary:
+
+            inequality_field, filters = self._formatFilters(request.filters)
+
+            options['projection'], overrides = self._summaryProjection(
+                filters)
+
+        # run the query exactly once, either as a page or as a single batch
+        nextPageToken = None
+
+        if request.pageSize:
+
+            conferences, nextPageToken = yield fetchPageAsync(
+                query, request.pageSize, request.pageToken, **options)
+
+        else:
+
+            conferences = yield query.fetch_async(**options)
+
+        if request.summary:
+
+            forms = ConferenceForms(
+                summaries=[self._copyConferenceToSummary(conf, overrides)
+                           for conf in conferences])
+
+        else:
+
+            forms = yield self._conferenceFormsAsync(conferences)
+
+        forms.nextPageToken = nextPageToken
+
+        raise ndb.Return(forms)
 
     @endpoints.method(
-        message_types.VoidMessage,
+        CONF_CREATED_REQUEST,
         ConferenceForms,
         path='getConferencesCreated',
         http_method='POST',
         name='getConferencesCreated')
+    @recordMetrics
     def getConferencesCreated(self, request):
-        """Return conferences created by user."""
+        """Return conferences created by user, as summaries if asked."""
         
         # Getting and Verifying current user
         user = getUser()
@@ -569,14 +1021,20 @@ class ConferenceApi(remote.Service):
         user_id = getUserId(user)
 
         # create ancestor query for all key matches for this user
-        conferences = Conference.query(ancestor=ndb.Key(Profile, user_id))
-        
-        prof = ndb.Key(Profile, user_id).get()
-        
-        # return one or many ConferenceForm objects
-        return ConferenceForms(
-            items = [self._copyConferenceToForm(
-                conf, getattr(prof, 'displayName')) for conf in conferences])
+        query = Conference.query(ancestor=ndb.Key(Profile, user_id))
+
+        if request.summary:
+
+            conferences = query.fetch(projection=SUMMARY_PROPERTIES)
+
+            return ConferenceForms(
+                summaries=[self._copyConferenceToSummary(conf, {})
+                           for conf in conferences])
+
+        conferences = query.fetch()
+
+        # return one or many ConferenceForm objects
+        return self._conferenceFormsAsync(conferences).get_result()
 
     @endpoints.method(
         CONF_GET_BY_DATE,
@@ -584,67 +1042,99 @@ class ConferenceApi(remote.Service):
         path='getConferencesByDate/{date}',
         http_method='GET',
         name='getConferencesByDate')
+    @recordMetrics
     def getConferencesByDate(self, request):
-        """Given a Conference key and date return the associated Conference. 
-        """
-        
-        # Getting and Verifying current user
-        user = getUser()
-
-        # get the user_id (email) 
-        user_id = getUserId(user)
-
-        conferences = Conference.query()
+        """Return the conferences starting on a date."""
 
         # Convert the date string passed to a date Object
-        date = datetime.strptime(request.date[:10], "%Y-%m-%d").date()
+        date = self._parseDate(request.date, 'date')
 
         # Get the Conferences
-        conferences = conferences.filter(Conference.startDate == date)
-        
-        prof = ndb.Key(Profile, user_id).get()
-        
-        # return one or many ConferenceForm objects
-        return ConferenceForms(
-            items = [self._copyConferenceToForm(
-                conf, getattr(prof, 'displayName')) for conf in conferences])
+        conferences = Conference.query(Conference.startDate == date).fetch()
+
+        # the organisers' names are stored on the conferences
+        return self._conferenceFormsAsync(conferences).get_result()
+
+    @endpoints.method(
+        CONF_GET_BY_DATE_RANGE,
+        ConferenceForms,
+        path='getConferencesByDateRange',
+        http_method='GET',
+        name='getConferencesByDateRange')
+    @recordMetrics
+    def getConferencesByDateRange(self, request):
+        """Return a page of the conferences starting between fromDate and
+        toDate (inclusive), optionally in one city or on one topic."""
+
+        fromDate = self._parseDate(request.fromDate, 'fromDate')
+
+        toDate = self._parseDate(request.toDate, 'toDate')
+
+        if fromDate > toDate:
+
+            raise endpoints.BadRequestException(
+                "fromDate must not be after toDate.")
+
+        # repeated ranges are served from the cache until a conference
+        # changes anywhere in the catalog
+        response = 'getConferencesByDateRange:%s' % json.dumps(
+            [str(fromDate), str(toDate), request.city, request.topic,
+             request.pageSize, request.pageToken])
+
+        return cachedResponse(
+            CATALOG_GENERATION, response, ConferenceForms,
+            lambda: self._conferencesByDateRangeAsync(
+                fromDate, toDate, request).get_result())
+
+    @ndb.tasklet
+    def _conferencesByDateRangeAsync(self, fromDate, toDate, request):
+        """Fetch one page of a date range query and build its forms
+        (tasklet)."""
+
+        # the range is the query's only inequality, so it is read off the
+        # startDate index (with city or topics in front when given)
+        query = Conference.query(Conference.startDate >= fromDate,
+                                 Conference.startDate <= toDate)
+
+        if request.city:
+
+            query = query.filter(Conference.city == request.city)
+
+        if request.topic:
+
+            query = query.filter(Conference.topics == request.topic)
+
+        query = query.order(Conference.startDate, Conference.key)
+
+        conferences, nextPageToken = yield fetchPageAsync(
+            query, request.pageSize or MAX_PAGE_SIZE, request.pageToken)
+
+        forms = yield self._conferenceFormsAsync(conferences)
+
+        forms.nextPageToken = nextPageToken
+
+        raise ndb.Return(forms)
+
+    def _parseDate(self, value, field):
+        """Convert a YYYY-MM-DD request value to a date."""
+
+        try:
+
+            return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+        except (TypeError, ValueError):
+
+            raise endpoints.BadRequestException(
+                field + " must be a date formatted YYYY-MM-DD.")
 
 # - - - Session objects - - - - - - - - - - - - - - - - -
 
     def _copyConferenceSessionToForm(self, session):
         """Copy relevant fields from Session to SessionForm."""
 
-        sf = SessionForm()
-        
-        for field in sf.all_fields():
-        
-            if hasattr(session, field.name):
-        
-                # Convert date and startTime fields to strings
-                if field.name == 'date' or field.name == 'startTime':
-        
-                    setattr(sf, field.name, str(getattr(session, field.name)))
-        
-                # Convert typeOfSession to enum
-                elif field.name == 'typeOfSession':
-                    
-                    # set typeOfSession equal to enum 
-                    setattr(
-                        sf, field.name, getattr(
-                            SessionType, getattr(session, field.name)))
-                
-                else:
-                
-                    setattr(sf, field.name, getattr(session, field.name))
-            
-            # Convert DataStore keys to URLSafe keys
-            elif field.name == 'parentKey' or field.name == 'speakerKey':
-            
-                setattr(sf, field.name, session.key.urlsafe())
-        
-        sf.check_initialized()
-        
-        return sf
+        # date and startTime are converted to strings, typeOfSession to
+        # its enum; others are just copied
+        return copyToForm(session, SessionForm)
 
     def _createSessionObject(self, request):
         """Create a Session object, returning SessionForm/request."""
@@ -662,34 +1152,110 @@ class ConferenceApi(remote.Service):
         checkField(request.parentKey, 'parentKey')
         
         # Attempt to retrieve the Conference or raise an exception
+        _key = self._sessionParentKey(request)
+        
+        # Check speakerKey and save them
+        speakerKeys = self._sessionSpeakerKeys(request)
+
+        # Retrieve the Conference Obj, its speaker index and every speaker
+        # in a single batch
+        entities = ndb.get_multi(
+            [_key, ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=_key)] +
+            speakerKeys)
+
+        conf, index, speakers = entities[0], entities[1], entities[2:]
+
+        # check the form and turn it into Session properties
+        data = self._sessionData(request, user_id, conf, speakers)
+
+        # Conferences that predate the speaker index get it stored first,
+        # as it names speakers the session transaction can't read
+        if index is None:
+
+            self._storeSpeakerIndex(_key)
+        
+        # Create a session id for the Session,
+        # create the relationship with parent key.
+        s_id = Session.allocate_ids(size=1, parent=_key)[0]
+        
+        # Create the session key
+        s_key = ndb.Key(Session, s_id, parent=_key)
+        
+        # Fill the session key
+        data['key'] = s_key
+        
+        # Store in the DataStore, together with the schedule, the speaker
+        # index, the speakers' session counters and session lists
+        featured_changed = self._putSessionObjects(
+            _key, [Session(**data)],
+            {spkr.key: spkr for spkr in speakers})
+
+        tasks = TaskBatch()
+
+        # Advise of the featured Speakers using the taskQueue
+        if featured_changed:
+            tasks.add(
+                params = {'websafeConferenceKey': request.parentKey},
+                url    = '/tasks/set_featured_speaker',
+                method = 'GET')
+        
+        # Send an email to the conference organizer
+        queueEmail(
+            tasks, user.email(),
+            'You Created a New Session for %s!' % conf.name,
+            'Here are the details for new Session:', emailInfo(request))
+
+        # both tasks go in one RPC once the session is stored, overlapping
+        # the cache bump
+        tasks.flushAsync()
+
+        # cached session lists of the conference are now stale
+        self._bumpConference(_key, catalog=False)
+
+        tasks.wait()
+        return request
+
+    def _sessionParentKey(self, request):
+        """Return the key of the Conference a SessionForm is for."""
+
         try:
-            _key = ndb.Key(urlsafe=request.parentKey)
+            return ndb.Key(urlsafe=request.parentKey)
         except Exception:
             raise endpoints.BadRequestException(
                 'The parentKey given is invalid.')
-        
-        # Retrieve the Conference Obj 
-        conf = _key.get()
-        
+
+    def _sessionSpeakerKeys(self, request):
+        """Return the keys of the speakers of a SessionForm."""
+
+        try:
+            return [ndb.Key(urlsafe=speakerKey)
+                    for speakerKey in request.speakerKey]
+        except Exception:
+            raise endpoints.BadRequestException(
+                'Check the speakerKey it is invalid.')
+
+    def _sessionData(self, request, user_id, conf, speakers):
+        """Check a SessionForm against its Conference and speakers (None
+        when missing) and return the properties of the new Session, without
+        its key; the defaults applied are copied back onto the form."""
+
+        checkObj(conf, 'Conference')
+
         # Verify that the current user created the conference
         if user_id != conf.organizerUserId:
             raise endpoints.ForbiddenException(
                 'Only the conference creator can add a session to it.')
-        
-        # Check speakerKey and save them
-        speakers = []
-        
-        if request.speakerKey:
-        
-            for speakerKey in request.speakerKey:
-        
-                try:
-                    speaker = ndb.Key(urlsafe=speakerKey).get()
-                    speakers.append(speaker)
-        
-                except Exception:
-                    raise endpoints.BadRequestException(
-                        'Check the speakerKey it is invalid.')
+
+        if not all(speakers):
+            raise endpoints.BadRequestException(
+                'Check the speakerKey it is invalid.')
+
+        # the session is written with each speaker's SpeakerSessions in
+        # one cross-group transaction
+        if len(set(spkr.key for spkr in speakers)) + 1 > MAX_XG_GROUPS:
+            raise endpoints.BadRequestException(
+                'A session can have at most %d speakers.' % (
+                    MAX_XG_GROUPS - 1))
         
         # Copy SessionForm/ProtoRPC Message into dict
         data = ({field.name: getattr(request, field.name)
@@ -707,120 +1273,427 @@ class ConferenceApi(remote.Service):
         # Converting the date info from strings to Date objects
         # setting the object month to the start dates month
         if data['date']:
-            data['date'] = (datetime.strptime(
-                            data['date'][:10], "%Y-%m-%d").date())
+            data['date'] = self._parseDate(data['date'], 'date')
             data['month'] = data['date'].month
         else:
             data['month'] = conf.month
         
         # Convert startTime from string to Time object
-        if data['startTime']:
-        
-            data['startTime'] = (datetime.strptime(
-                                 data['startTime'][:5], "%H:%M").time())
+        data['startTime'] = self._parseTime(data['startTime'], 'startTime')
         
          # Convert typeOfSession to string
         if data['typeOfSession']:
         
             data['typeOfSession'] = str(data['typeOfSession'])
-        
-        # Create a session id for the Session,
-        # create the relationship with parent key.
-        s_id = Session.allocate_ids(size=1, parent=_key)[0]
-        
-        # Create the session key
-        s_key = ndb.Key(Session, s_id, parent=_key)
-        
-        # Fill the session key
-        data['key'] = s_key
-        
-        # Check that the speaker was passed
-        if speakers:
 
-            #  Query the session for instance of speakers 
-            s = Session.query(
-                ancestor=ndb.Key(urlsafe=request.parentKey))
-            
-            # Setting none as featured
-            featured = None
-            
-            # Number of session
-            instance_count = 0
+        return data
 
-            for spkr in data['speakerKey']:
-                
-                i_count = s.filter(Session.speakerKey == spkr).count()
-                
-                if i_count >= instance_count:
-                
-                    featured = spkr
-                
-                    minSessions = i_count
+    @ndb.transactional(xg=True)
+    def _putSessionObjects(self, c_key, sessions, speakers, listed=True):
+        """Store new Sessions of a Conference, add them to its
+        SessionSchedule, add their speakers to the SpeakerIndex and count
+        the sessions against each speaker; with listed, also add them to
+        the speakers' SpeakerSessions, one entity group per speaker, and
+        otherwise queue a task that does, with the commit. speakers maps the
+        key of each speaker of the sessions to the Speaker. Returns True
+        when the featured speaker leaderboard changed."""
 
-            # Advise of the featured Speaker using the taskQueue
-            if featured:
-                taskqueue.add(
-                    params = {
-                        'websafeConferenceKey': request.parentKey,
-                        'websafeSpeakerKey'   : featured},
-                    url    = '/tasks/set_featured_speaker',
-                    method = 'GET')
+        spkr_keys = list(speakers)
 
-        # Store in the DataStore
-        Session(**data).put()
-        
-        # Send an email to the conference organizer
-        taskqueue.add(
-            params = {
-                'email'   : user.email(),
-                'subject' : 'You Created a New Session for %s!' % conf.name,
-                'body'    : 'Here are the details for new Session:',
-                'info'    : repr(request)},
-            url    = '/tasks/send_confirmation_email')
-        return request
+        count_keys = [self._speakerCountKey(c_key, spkr_key)
+                      for spkr_key in spkr_keys]
 
+        sessions_keys = [self._speakerSessionsKey(spkr_key)
+                         for spkr_key in spkr_keys] if listed else []
 
-# - - - Endpoints Methods (Session)  - - - - - - - - - - - - - - - - - - - -
+        # the schedule, the index, the counters and the speakers' session
+        # lists come back in one batch
+        entities = ndb.get_multi(
+            [ndb.Key(SessionSchedule, SCHEDULE_ID, parent=c_key),
+             ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=c_key)] +
+            count_keys + sessions_keys)
 
-    @endpoints.method(
-        SessionForm,
-        SessionForm,
-        path='sessions',
-        http_method='POST',
-        name='createSession')
-    def createSession(self, request):
-        """Create a new Session."""
-        
-        return self._createSessionObject(request)
+        schedule, index = entities[0], entities[1]
+
+        counters = entities[2:2 + len(spkr_keys)]
+
+        speaker_sessions = entities[2 + len(spkr_keys):]
+
+        # Conferences that predate the schedule get it built from their
+        # sessions, which don't include these yet
+        if schedule is None:
+
+            schedule, chunks = self._buildSessionSchedule(c_key)
+
+        else:
+
+            chunks = []
+
+        # only the open chunk, and any it fills, is written
+        chunks.extend(self._scheduleSessions(schedule, sessions))
+
+        to_put = list(sessions) + [schedule] + chunks
+
+        if listed:
+
+            to_put.extend(self._listSpeakerSessions(
+                spkr_keys, speaker_sessions, sessions))
+
+        # Conferences that predate the index have it stored by the callers
+        # first; should it still be missing, the speakers at hand name it
+        if index is None:
+
+            index, built = self._buildSpeakerIndex(
+                c_key, {spkr_key: spkr.name
+                        for spkr_key, spkr in speakers.items()})
+
+            built = {counter.key: counter for counter in built}
+
+            counters = [built.get(k) for k in count_keys]
+
+            to_put.extend(built.values())
+
+        featured = list(index.featured)
+
+        counters = dict(zip(spkr_keys, counters))
+
+        for session in sessions:
+
+            for spkr_key in {ndb.Key(urlsafe=webSafeKey)
+                             for webSafeKey in session.speakerKey}:
+
+                counter = counters[spkr_key]
+
+                if counter is None:
+
+                    counter = counters[spkr_key] = SpeakerSessionCount(
+                        key=self._speakerCountKey(c_key, spkr_key),
+                        speakerKey=spkr_key, name=speakers[spkr_key].name)
+
+                    index.speakerKeys.append(spkr_key)
+
+                counter.count += 1
+
+                self._rankFeaturedSpeaker(index, counter)
+
+        for counter in counters.values():
+
+            if counter is not None and counter not in to_put:
+                to_put.append(counter)
+
+        to_put.append(index)
+
+        if len(to_put) > MAX_COMMIT_ENTITIES:
+
+            raise datastore_errors.BadRequestError(
+                'Too many entities for one commit: %d.' % len(to_put))
+
+        ndb.put_multi(to_put)
+
+        if not listed:
+
+            # added with the commit, and safe to run more than once
+            taskqueue.add(
+                params = {'sessionKeys': [session.key.urlsafe()
+                                          for session in sessions]},
+                url    = '/tasks/append_speaker_sessions',
+                transactional = True)
+
+        return index.featured != featured
+
+    @staticmethod
+    def _listSpeakerSessions(spkr_keys, speaker_sessions, sessions):
+        """Return the SpeakerSessions of speakers (as read, None when
+        missing) with the keys of the sessions each one gives appended,
+        leaving out those already listed."""
+
+        to_put = []
+
+        for spkr_key, listed in zip(spkr_keys, speaker_sessions):
+
+            # a speaker without a list gets one holding just these sessions;
+            # the sessions written before it are merged in when it is
+            # first read
+            if listed is None:
+
+                listed = SpeakerSessions(
+                    key=ConferenceApi._speakerSessionsKey(spkr_key))
+
+            known = set(listed.sessionKeys)
+
+            listed.sessionKeys.extend(
+                session.key for session in sessions
+                if session.key not in known and
+                spkr_key in {ndb.Key(urlsafe=webSafeKey)
+                             for webSafeKey in session.speakerKey})
+
+            to_put.append(listed)
+
+        return to_put
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _appendSpeakerSessions(spkr_keys, sessions):
+        """Add Sessions to the SpeakerSessions of a few speakers (one entity
+        group each) in one cross-group transaction."""
+
+        ndb.put_multi(ConferenceApi._listSpeakerSessions(
+            spkr_keys,
+            ndb.get_multi([ConferenceApi._speakerSessionsKey(spkr_key)
+                           for spkr_key in spkr_keys]),
+            sessions))
+
+    @staticmethod
+    def _appendSpeakerSessionsTask(websafeSessionKeys):
+        """Add Sessions stored by a bulk create to their speakers'
+        SpeakerSessions, a few speakers per transaction; sessions already
+        listed are skipped, so the task can be retried."""
+
+        sessions = [session for session in ndb.get_multi(
+            [ndb.Key(urlsafe=wssk) for wssk in websafeSessionKeys])
+            if session]
+
+        by_speaker = {}
+
+        for session in sessions:
+
+            for spkr_key in {ndb.Key(urlsafe=webSafeKey)
+                             for webSafeKey in session.speakerKey}:
+
+                by_speaker.setdefault(spkr_key, []).append(session)
+
+        spkr_keys = list(by_speaker)
+
+        for start in range(0, len(spkr_keys), MAX_XG_GROUPS):
+
+            chunk = spkr_keys[start:start + MAX_XG_GROUPS]
+
+            ConferenceApi._appendSpeakerSessions(
+                chunk, list({session.key: session for spkr_key in chunk
+                             for session in by_speaker[spkr_key]}.values()))
+
+    @staticmethod
+    def _scheduleSessions(schedule, sessions):
+        """Append Sessions to the open SessionSchedule chunk, first handing
+        its sessions to a new full chunk whenever it holds
+        SCHEDULE_CHUNK_SIZE of them or the next would take it past
+        SCHEDULE_CHUNK_BYTES. Returns the full chunks made."""
+
+        chunks = []
+
+        # chunks stored before size was kept are measured once
+        if schedule.sessions and not schedule.size:
+
+            schedule.size = sum(len(sess._to_pb().Encode())
+                                for sess in schedule.sessions)
+
+        for session in sessions:
+
+            size = len(session._to_pb().Encode())
+
+            if schedule.sessions and (
+                    len(schedule.sessions) >= SCHEDULE_CHUNK_SIZE or
+                    schedule.size + size > SCHEDULE_CHUNK_BYTES):
+
+                schedule.full += 1
+
+                chunks.append(SessionSchedule(
+                    key=ndb.Key(SessionSchedule, schedule.full,
+                                parent=schedule.key.parent()),
+                    sessions=schedule.sessions, size=schedule.size))
+
+                schedule.sessions, schedule.size = [], 0
+
+            schedule.sessions.append(session)
+
+            schedule.size += size
+
+        return chunks
+
+    def _buildSessionSchedule(self, c_key):
+        """Build the SessionSchedule of a Conference from its sessions; only
+        needed for conferences that predate it. Returns the open chunk and
+        the full ones."""
+
+        schedule = SessionSchedule(
+            key=ndb.Key(SessionSchedule, SCHEDULE_ID, parent=c_key))
+
+        return schedule, self._scheduleSessions(
+            schedule, Session.query(ancestor=c_key).fetch())
+
+    @ndb.transactional()
+    def _storeSessionSchedule(self, c_key):
+        """Build and store the SessionSchedule of a Conference that lacks
+        one. Returns the open chunk and the full ones."""
+
+        schedule = ndb.Key(SessionSchedule, SCHEDULE_ID, parent=c_key).get()
+
+        if schedule is not None:
+
+            return schedule, None
+
+        schedule, chunks = self._buildSessionSchedule(c_key)
+
+        ndb.put_multi([schedule] + chunks)
+
+        return schedule, chunks
+
+    def _conferenceSchedule(self, c_key):
+        """Return the sessions of a Conference from its SessionSchedule,
+        the open chunk read together with the Conference in one batch and
+        any full chunks in a second."""
+
+        conf, schedule = ndb.get_multi(
+            [c_key, ndb.Key(SessionSchedule, SCHEDULE_ID, parent=c_key)])
 
-    @endpoints.method(
-        CONF_GET_REQUEST,
-        SessionForms,
-        path='sessions/{websafeConferenceKey}',
-        http_method='GET',
-        name='getSessionsByConference')
-    def getConferenceSessions(self, request):
-        """Given a conference, return all sessions."""
-        
-        # Getting and Verifying current user
-        user = getUser()
-        
-        # Retrieve the Conference key
-        try:
-            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
-        except Exception:
-            raise endpoints.BadRequestException(
-                'The websafeConferenceKey given is invalid.')
-        
         # Verify that the Conference exists
-        conf = c_key.get()
-        
         checkObj(conf, 'Conference')
 
-        # Store Sessions that are ancestors
-        sessions = Session.query(ancestor=c_key)
-        
-        # Return a SessionForm for each Session
+        chunks = None
+
+        if schedule is None:
+
+            schedule, chunks = self._storeSessionSchedule(c_key)
+
+        if chunks is None:
+
+            chunks = ndb.get_multi(
+                [ndb.Key(SessionSchedule, i, parent=c_key)
+                 for i in range(1, schedule.full + 1)])
+
+        # the full chunks hold the earlier sessions, in order
+        return [sess for chunk in chunks + [schedule] if chunk
+                for sess in chunk.sessions]
+
+    @staticmethod
+    def _speakerSessionsKey(speaker_key):
+        """Return the key of a Speaker's SpeakerSessions."""
+
+        return ndb.Key(SpeakerSessions, SPEAKER_SESSIONS_ID,
+                       parent=speaker_key)
+
+    @staticmethod
+    def _speakerCountKey(c_key, speaker_key):
+        """Return the key of a Speaker's SpeakerSessionCount in a Conference.
+        """
+
+        return ndb.Key(SpeakerSessionCount, speaker_key.id(), parent=c_key)
+
+    @staticmethod
+    def _rankFeaturedSpeaker(index, counter):
+        """Move a Speaker whose session count grew to its place in the
+        SpeakerIndex leaderboard. Counts only ever grow, so checking the
+        speaker whose count changed is enough to keep the top N exact."""
+
+        featured = [f for f in index.featured
+                    if f.speakerKey != counter.speakerKey]
+
+        if counter.count >= FEATURED_SPEAKER_MIN_SESSIONS:
+
+            featured.append(FeaturedSpeaker(speakerKey=counter.speakerKey,
+                                            name=counter.name,
+                                            sessions=counter.count))
+
+        # sort is stable: on a tie the speaker featured first stays ahead
+        featured.sort(key=lambda f: -f.sessions)
+
+        index.featured = featured[:FEATURED_SPEAKERS_SHOWN]
+
+    @staticmethod
+    def _buildSpeakerIndex(c_key, names):
+        """Build the SpeakerIndex and SpeakerSessionCounts of a Conference
+        from its sessions; only needed for conferences that predate them.
+        names maps speaker keys to their names, read beforehand: Speakers
+        are root entities, which the transactions this runs in can't read.
+        """
+
+        counts = {}
+
+        for sess in Session.query(ancestor=c_key):
+
+            for webSafeKey in set(sess.speakerKey):
+
+                speaker_key = ndb.Key(urlsafe=webSafeKey)
+
+                counts[speaker_key] = counts.get(speaker_key, 0) + 1
+
+        speakerKeys = list(counts)
+
+        index = SpeakerIndex(
+            key=ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=c_key),
+            speakerKeys=speakerKeys)
+
+        counters = []
+
+        for spkr_key in speakerKeys:
+
+            counter = SpeakerSessionCount(
+                key=ConferenceApi._speakerCountKey(c_key, spkr_key),
+                speakerKey=spkr_key,
+                name=names.get(spkr_key),
+                count=counts[spkr_key])
+
+            ConferenceApi._rankFeaturedSpeaker(index, counter)
+
+            counters.append(counter)
+
+        return index, counters
+
+
+# - - - Endpoints Methods (Session)  - - - - - - - - - - - - - - - - - - - -
+
+    @endpoints.method(
+        SessionForm,
+        SessionForm,
+        path='sessions',
+        http_method='POST',
+        name='createSession')
+    @recordMetrics
+    def createSession(self, request):
+        """Create a new Session."""
+        
+        return self._createSessionObject(request)
+
+    @endpoints.method(
+        CONF_GET_REQUEST,
+        SessionForms,
+        path='sessions/{websafeConferenceKey}',
+        http_method='GET',
+        name='getSessionsByConference')
+    @recordMetrics
+    def getConferenceSessions(self, request):
+        """Given a conference, return all sessions."""
+        
+        # Getting and Verifying current user
+        user = getUser()
+        
+        # Retrieve the Conference key
+        try:
+            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
+        except Exception:
+            raise endpoints.BadRequestException(
+                'The websafeConferenceKey given is invalid.')
+        
+        # Return a SessionForm for each Session, cached until the
+        # conference changes
+        return cachedResponse(
+            CONFERENCE_GENERATION % c_key.urlsafe(),
+            'getConferenceSessions', SessionForms,
+            lambda: self._conferenceSessionForms(c_key))
+
+    def _conferenceSessionForms(self, c_key, typeOfSession=None):
+        """Return SessionForms of a Conference's sessions, optionally only
+        those of one type."""
+
+        # one read of the Conference and its SessionSchedule
+        sessions = self._conferenceSchedule(c_key)
+
+        # Keep the Sessions of the type specified
+        if typeOfSession:
+            sessions = [sess for sess in sessions
+                        if sess.typeOfSession == typeOfSession]
+
+        # Return a SessionForm for each Session
         return SessionForms(
             items = [self._copyConferenceSessionToForm(
                 sess) for sess in sessions])
@@ -832,209 +1705,712 @@ class ConferenceApi(remote.Service):
         '{websafeConferenceKey}/{typeOfSession}',
         http_method='GET',
         name='getConferenceSessionsByType')
+    @recordMetrics
     def getConferenceSessionsByType(self, request):
         """Given a conference and session type, return matching sessions."""
         
         # Confirm the user is authorized
         user = getUser()
 
-        # First query for a session with specified key
-        sessions = Session.query(
-            ancestor=ndb.Key(urlsafe=request.websafeConferenceKey))
-        
-        # Second query for remaining Sessions by the type specified
-        sessions = sessions.filter(
-            Session.typeOfSession == request.typeOfSession)
-        
-        # Return a SessionForm for each Session
-        return SessionForms(
-            items = [self._copyConferenceSessionToForm(
-                sess) for sess in sessions])
+        c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
+
+        # Return a SessionForm for each Session of the type specified,
+        # cached until the conference changes
+        return cachedResponse(
+            CONFERENCE_GENERATION % c_key.urlsafe(),
+            'getConferenceSessionsByType:%s' % request.typeOfSession,
+            SessionForms,
+            lambda: self._conferenceSessionForms(
+                c_key, request.typeOfSession))
+
+    @endpoints.method(
+        SESH_BY_TIME_AND_TYPE_GET_REQUEST,
+        SessionForms,
+        path='filterConferenceSessions/{websafeConferenceKey}',
+        http_method='GET',
+        name='filterConferenceSessions')
+    @recordMetrics
+    def filterConferenceSessions(self, request):
+        """Return a conference's sessions matching any combination of a
+        start time window, excluded types, duration bounds and a date."""
+
+        c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
+
+        # every bound is optional; each one is a range on a property
+        ranges = {
+            'startTime': (
+                self._parseTime(request.noEarlierThan, 'noEarlierThan'),
+                self._parseTime(request.noLaterThen, 'noLaterThen')),
+            'duration': (request.minDuration, request.maxDuration)}
+
+        if request.date:
+
+            date = self._parseDate(request.date, 'date')
+
+            ranges['date'] = (date, date)
+
+        # the datastore can't combine these inequalities, so they are
+        # evaluated against the conference's in-memory SessionIndex
+        sessions = self._sessionIndex(c_key).select(
+            ranges, request.excludeTypeOfSession)
+
+        return SessionForms(
+            items = [self._copyConferenceSessionToForm(
+                sess) for sess in sessions])
+
+    def _sessionIndex(self, c_key):
+        """Return the SessionIndex of a Conference, built from one ancestor
+        query and kept by the instance until the conference changes."""
+
+        generation = getGeneration(CONFERENCE_GENERATION % c_key.urlsafe())
+
+        cache_key = SESSION_INDEX_KEY % (c_key.urlsafe(), generation)
+
+        index = LOCAL_CACHE.get(cache_key)
+
+        if index is None:
+
+            index = SessionIndex(self._conferenceSchedule(c_key))
+
+            LOCAL_CACHE.set(cache_key, index, SESSION_INDEX_TTL)
+
+        return index
+
+    def _parseTime(self, value, field):
+        """Convert an optional HH:MM request value to a time."""
+
+        if not value:
+            return None
+
+        try:
+
+            return datetime.strptime(value[:5], "%H:%M").time()
+
+        except ValueError:
+
+            raise endpoints.BadRequestException(
+                field + " must be a time formatted HH:MM.")
+
+
+# - - - Speaker objects - - - - - - - - - - - - - - - - -
+
+    def _copySpeakerToForm(self, speaker):
+        """Copy relevant fields from Speaker to SpeakerForm"""
+
+        return copyToForm(speaker, SpeakerForm)
+
+    def _createSpeakerObject(self, request):
+        """Create a Speaker object, returning SpeakerForm/request."""
+        
+        # Getting and Verifying current user
+        user = getUser()
+
+        # check the form and turn it into Speaker properties
+        data = self._speakerData(request)
+
+        # Create a key for the Speaker
+        s_id  = Session.allocate_ids(size=1)[0]
+        s_key = ndb.Key(Speaker, s_id)
+        
+        # Update stored session with session keys
+        data['key'] = s_key
+        
+        tasks = TaskBatch()
+
+        queueEmail(
+            tasks, user.email(), 'You Added %s as a Speaker!' % data['name'],
+            'Here are the details for the added speaker:', emailInfo(request))
+
+        # Create the speaker, then queue the email, and return the form
+        Speaker(**data).put()
+
+        tasks.flush()
+        
+        return request
+
+    def _speakerData(self, request):
+        """Check a SpeakerForm and return the properties of the new Speaker
+        it describes, without its key."""
+
+        # Confirm the field is filled out
+        checkField(request.name, 'name')
+
+        # Copy SpeakerForm/ProtoRPC Message into dict
+        return ({field.name: getattr(request, field.name)
+                for field in request.all_fields()})
+
+    @endpoints.method(
+        SpeakerForm,
+        SpeakerForm,
+        path='speaker',
+        http_method='POST',
+        name='createSpeaker')
+    @recordMetrics
+    def createSpeaker(self, request):
+        """Create a Speaker."""
+        
+        return self._createSpeakerObject(request)
+
+    @endpoints.method(
+        CONF_GET_REQUEST,
+        SpeakerForms,
+        path=('getSpeakersByConference/{websafeConferenceKey}'),
+        http_method='GET',
+        name='getSpeakersByConference')
+    @recordMetrics
+    def getSpeakersByConference(self, request):
+        """Given a websafeConferenceKey, return all speakers."""
+        
+        # Getting and Verifying current user
+        user = getUser()
+
+        # Retrieve the Conference key
+        try:
+            
+            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
+        
+        except Exception:
+        
+            raise endpoints.BadRequestException(
+                'The websafeConferenceKey is invalid.')
+        
+        # Verify that the conference exists, fetching its speaker index
+        # in the same round trip
+        conference, index = ndb.get_multi(
+            [c_key, ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=c_key)])
+
+        checkObj(conference, 'Conference')
+
+        # Conferences that predate the index get it built from their sessions
+        if index is None:
+
+            index = self._storeSpeakerIndex(c_key)
+
+        # Get every speaker in a single batch
+        speakers = [spkr for spkr in ndb.get_multi(index.speakerKeys) if spkr]
+
+        # Return one or many SpeakerForms for Speakers
+        return SpeakerForms(
+            items = [self._copySpeakerToForm(
+                spkr) for spkr in speakers])
+
+    @staticmethod
+    def _storeSpeakerIndex(c_key):
+        """Build and store the SpeakerIndex of a Conference that lacks one.
+        """
+
+        # the speakers' names, outside the transaction
+        spkr_keys = list({ndb.Key(urlsafe=webSafeKey)
+                          for sess in Session.query(ancestor=c_key)
+                          for webSafeKey in sess.speakerKey})
+
+        names = {spkr.key: spkr.name
+                 for spkr in ndb.get_multi(spkr_keys) if spkr}
+
+        return ConferenceApi._putSpeakerIndex(c_key, names)
+
+    @staticmethod
+    @ndb.transactional()
+    def _putSpeakerIndex(c_key, names):
+        """Store the SpeakerIndex of a Conference unless one exists, naming
+        the speakers from names."""
+
+        index = ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=c_key).get()
+
+        if index is None:
+
+            index, counters = ConferenceApi._buildSpeakerIndex(c_key, names)
+
+            ndb.put_multi([index] + counters)
+
+        return index
+
+    @endpoints.method(
+        SPEAKER_SESSIONS_GET_REQUEST,
+        SessionForms,
+        path='getSessionsBySpeaker/{websafeSpeakerKey}',
+        http_method='GET',
+        name='getSessionsBySpeaker')
+    @recordMetrics
+    def getSessionsBySpeaker(self, request):
+        """Return a page of the sessions a speaker gives, across all
+        conferences."""
+
+        # Retrieve the Speaker key
+        try:
+            spkr_key = ndb.Key(urlsafe=request.websafeSpeakerKey)
+        except Exception:
+            raise endpoints.BadRequestException(
+                'The websafeSpeakerKey given is invalid.')
+
+        pageSize = request.pageSize or MAX_PAGE_SIZE
+
+        # the page token is the position of the page in the session list
+        try:
+            start = int(request.pageToken or 0)
+        except ValueError:
+            start = -1
+
+        if pageSize <= 0 or start < 0:
+            raise endpoints.BadRequestException(
+                'The pageSize or pageToken given is invalid.')
+
+        stop = start + min(pageSize, MAX_PAGE_SIZE)
+
+        # one read for the speaker and their session list, one for the
+        # page of sessions, however many conferences the speaker is in
+        spkr, listed = ndb.get_multi(
+            [spkr_key, self._speakerSessionsKey(spkr_key)])
+
+        checkObj(spkr, 'Speaker')
+
+        if listed is None or not listed.complete:
+
+            listed = self._storeSpeakerSessions(spkr_key)
+
+        sessions = ndb.get_multi(listed.sessionKeys[start:stop])
+
+        return SessionForms(
+            items = [self._copyConferenceSessionToForm(
+                sess) for sess in sessions if sess],
+            nextPageToken = (str(stop) if stop < len(listed.sessionKeys)
+                             else None))
+
+    def _storeSpeakerSessions(self, spkr_key):
+        """Complete a Speaker's SpeakerSessions with the Sessions written
+        before it existed; only needed once per speaker."""
+
+        # the query can't run in the transaction; sessions it misses are
+        # recent ones, already added to the list when they were written
+        legacy = Session.query(
+            Session.speakerKey == spkr_key.urlsafe()).fetch(keys_only=True)
+
+        return self._mergeSpeakerSessions(spkr_key, legacy)
+
+    @ndb.transactional()
+    def _mergeSpeakerSessions(self, spkr_key, legacy):
+        """Merge session keys into a Speaker's SpeakerSessions and mark it
+        complete."""
+
+        key = self._speakerSessionsKey(spkr_key)
+
+        listed = key.get() or SpeakerSessions(key=key)
+
+        if not listed.complete:
+
+            known = set(listed.sessionKeys)
+
+            listed.sessionKeys = [s_key for s_key in legacy
+                                  if s_key not in known] + listed.sessionKeys
+
+            listed.complete = True
+
+            listed.put()
+
+        return listed
+
+# - - - Featured Speakers - - - - - - - - - - - - - - - - - - - -
+
+    @staticmethod
+    def _cacheFeaturedSpeaker(websafeConferenceKey):
+        """Format the featured speaker leaderboard of a Conference and
+        add it to the memcache. Also run by a task, so a bad key is logged
+        rather than raised."""
+
+        # Retrieve the Conference key
+        try:
+
+            c_key = ndb.Key(urlsafe=websafeConferenceKey)
+
+        except Exception:
+
+            logging.warning('Featured speakers of an invalid conference '
+                            'key: %r', websafeConferenceKey)
+
+            return ""
+
+        # The leaderboard is kept up to date on the SpeakerIndex, read with
+        # the Conference
+        conf, index = ndb.get_multi(
+            [c_key, ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=c_key)])
+
+        # a missing conference has no speakers for a while
+        if conf is None:
+
+            logging.warning('Featured speakers of a missing conference: %s',
+                            websafeConferenceKey)
+
+            cacheSet(MEMCACHE_FEATURED_SPEAKER_KEY % websafeConferenceKey,
+                     "", FEATURED_SPEAKER_MISSING_TTL)
+
+            return ""
+
+        # Conferences that predate the index get it built from their sessions
+        if index is None:
+
+            index = ConferenceApi._storeSpeakerIndex(c_key)
+
+        featured = ""
+
+        if index.featured:
+
+            featured = '%s %s' % (
+                'Featured speakers:',
+                ', '.join('%s (%d sessions)' % (f.name, f.sessions)
+                          for f in index.featured))
+
+        cacheSet(MEMCACHE_FEATURED_SPEAKER_KEY % websafeConferenceKey,
+                 featured)
+
+        return featured
+
+    @endpoints.method(
+        GET_FEATURED_SPEAKER,
+        StringMessage,
+        path='getFeaturedSpeaker/{websafeConferenceKey}',
+        http_method='GET',
+        name='getFeaturedSpeaker')
+    @recordMetrics
+    def getFeaturedSpeaker(self, request):
+        """Return Featured Speakers of a Conference from the instance cache
+        or memcache."""
+
+        # Getting and Verifying current user
+        user = getUser()
+
+        # Verify the Conference key
+        try:
+
+            ndb.Key(urlsafe=request.websafeConferenceKey)
+
+        except Exception:
+
+            raise endpoints.BadRequestException(
+                'The websafeConferenceKey is invalid.')
+
+        # return the cached Featured Speakers, filling the cache on a miss
+        featured = cacheGet(
+            MEMCACHE_FEATURED_SPEAKER_KEY % request.websafeConferenceKey)
+
+        if featured is None:
+
+            featured = self._cacheFeaturedSpeaker(
+                request.websafeConferenceKey)
+
+        return StringMessage(data=featured)
+
+# - - - Bulk creation - - - - - - - - - - - - - - - - - - - -
+
+    def _batchResults(self, items):
+        """Check the size of a bulk create and return an empty result per
+        item."""
+
+        if not items:
+            raise endpoints.BadRequestException('There is nothing to create.')
+
+        if len(items) > BATCH_CREATE_LIMIT:
+            raise endpoints.BadRequestException(
+                'At most %d items can be created at once.' %
+                BATCH_CREATE_LIMIT)
+
+        return [BatchResultForm(index=i) for i in range(len(items))]
+
+    def _allocateKeys(self, model, parent, count):
+        """Allocate the keys of count new entities with one RPC."""
+
+        first, last = model.allocate_ids(size=count, parent=parent)
+
+        return [ndb.Key(model, i, parent=parent)
+                for i in range(first, last + 1)]
+
+    def _sendBatchSummary(self, tasks, user, kind, names):
+        """Queue one email to the user listing what a bulk create made."""
+
+        queueEmail(
+            tasks, user.email(), 'You Created %d New %s!' % (len(names), kind),
+            'Here is what was created:', '\r\n'.join(names))
+
+    @endpoints.method(
+        ConferenceForms,
+        BatchResultForms,
+        path='conferences/batch',
+        http_method='POST',
+        name='createConferences')
+    @recordMetrics
+    def createConferences(self, request):
+        """Create many conferences at once; each item is reported on
+        separately."""
+
+        user = getUser()
+
+        user_id = getUserId(user)
+
+        results = self._batchResults(request.items)
+
+        displayName = self._getProfileFromUser().displayName
+
+        valid = []
+
+        for result, form in zip(results, request.items):
+
+            try:
+                valid.append(
+                    (result, self._conferenceData(form, user_id, displayName)))
+            except endpoints.ServiceException as e:
+                result.error = str(e)
+
+        if valid:
+
+            # one allocation for every conference of the organiser
+            c_keys = self._allocateKeys(
+                Conference, ndb.Key(Profile, user_id), len(valid))
+
+            entities = []
+
+            for c_key, (result, data) in zip(c_keys, valid):
+
+                data['key'] = c_key
+
+                result.websafeKey = c_key.urlsafe()
+
+                entities.extend(self._newConferenceEntities(data))
+
+            tasks = TaskBatch()
+
+            self._sendBatchSummary(
+                tasks, user, 'Conferences',
+                [data['name'] for result, data in valid])
+
+            # the summary is only queued once the conferences are stored
+            self._putConferenceEntities(entities)
+
+            tasks.flushAsync()
+
+            # cached conference queries may now be missing them
+            bumpGeneration(CATALOG_GENERATION)
+
+            tasks.wait()
+
+        return BatchResultForms(items=results)
+
+    @endpoints.method(
+        SessionForms,
+        BatchResultForms,
+        path='sessions/batch',
+        http_method='POST',
+        name='createSessions')
+    @recordMetrics
+    def createSessions(self, request):
+        """Create many sessions, of one or more conferences, at once; each
+        item is reported on separately."""
+
+        user = getUser()
+
+        user_id = getUserId(user)
+
+        results = self._batchResults(request.items)
+
+        parsed = []
+
+        for result, form in zip(results, request.items):
+
+            try:
+                checkField(form.name, 'name')
+                checkField(form.parentKey, 'parentKey')
+                parsed.append((result, form, self._sessionParentKey(form),
+                               self._sessionSpeakerKeys(form)))
+            except endpoints.ServiceException as e:
+                result.error = str(e)
+
+        # every conference, its speaker index and speaker named, in one
+        # batch
+        keys = list({key for result, form, c_key, spkr_keys in parsed
+                     for key in [c_key, ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID,
+                                                parent=c_key)] + spkr_keys})
+
+        entities = dict(zip(keys, ndb.get_multi(keys)))
+
+        # the valid sessions, by conference
+        by_conference = {}
+
+        for result, form, c_key, spkr_keys in parsed:
+
+            try:
+                data = self._sessionData(form, user_id, entities[c_key],
+                                         [entities[k] for k in spkr_keys])
+            except endpoints.ServiceException as e:
+                result.error = str(e)
+                continue
+
+            by_conference.setdefault(c_key, []).append((result, data))
+
+        created = []
+
+        # the featured speaker tasks and the summary, queued together
+        tasks = TaskBatch()
+
+        for c_key, items in by_conference.items():
+
+            # stored ahead of the session transactions, see
+            # _createSessionObject
+            if entities[ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID,
+                                parent=c_key)] is None:
+
+                self._storeSpeakerIndex(c_key)
+
+            created.extend(
+                self._putBatchSessions(c_key, items, entities, tasks))
+
+        if created:
+
+            self._sendBatchSummary(
+                tasks, user, 'Sessions', [session.name for session in created])
+
+        # the speakers' session lists were queued with each transaction
+        tasks.flush()
+
+        return BatchResultForms(items=results)
+
+    def _sessionChunks(self, items):
+        """Split the (result, data) items of a bulk create into chunks of
+        at most SESSION_BATCH_TXN_SIZE sessions that, with a counter per
+        speaker, write at most SESSION_BATCH_TXN_ENTITIES entities."""
+
+        chunk, speakers = [], set()
+
+        for result, data in items:
+
+            more = speakers | set(data['speakerKey'] or [])
+
+            if chunk and (len(chunk) >= SESSION_BATCH_TXN_SIZE or
+                          len(chunk) + 1 + len(more) >
+                          SESSION_BATCH_TXN_ENTITIES):
+
+                yield chunk
+
+                chunk, more = [], set(data['speakerKey'] or [])
+
+            chunk.append((result, data))
+
+            speakers = more
+
+        if chunk:
+
+            yield chunk
+
+    def _putBatchSessions(self, c_key, items, entities, tasks):
+        """Store the sessions of one Conference from a bulk create, with one
+        id allocation and a transaction per chunk from _sessionChunks,
+        adding the tasks to run afterwards to tasks. Returns the Sessions
+        stored."""
 
+        for s_key, (result, data) in zip(
+                self._allocateKeys(Session, c_key, len(items)), items):
 
-# - - - Speaker objects - - - - - - - - - - - - - - - - -
+            data['key'] = s_key
 
-    def _copySpeakerToForm(self, speaker):
-        """Copy relevant fields from Speaker to SpeakerForm"""
-        
-        sf = SpeakerForm()
-        
-        for field in sf.all_fields():
-        
-            if hasattr(speaker, field.name):
-        
-                setattr(sf, field.name, getattr(speaker, field.name))
-        
-            elif field.name == "websafeKey":
-        
-                setattr(sf, field.name, speaker.key.urlsafe())
-        
-        sf.check_initialized()
-        
-        return sf
+        created = []
 
-    def _createSpeakerObject(self, request):
-        """Create a Speaker object, returning SpeakerForm/request."""
-        
-        # Getting and Verifying current user
-        user = getUser()
+        featured_changed = False
 
-        # Confirm the field is filled out
-        checkField(request.name, 'name')
+        for chunk in self._sessionChunks(items):
 
-        # Copy SpeakerForm/ProtoRPC Message into dict
-        data = ({field.name: getattr(request, field.name)
-                for field in request.all_fields()})
+            sessions = [Session(**data) for result, data in chunk]
 
-        # Create a key for the Speaker
-        s_id  = Session.allocate_ids(size=1)[0]
-        s_key = ndb.Key(Speaker, s_id)
-        
-        # Update stored session with session keys
-        data['key'] = s_key
-        
-        # Create and update session and return the form
-        Speaker(**data).put()
-        
-        taskqueue.add(
-        
-            params = {
-                'email'   : user.email(),
-                'subject' : 'You Added %s as a Speaker!' % data['name'],
-                'body'    : 'Here are the details for the added speaker:',
-                'info'    : repr(request)},
-        
-            url    = '/tasks/send_confirmation_email')
-        
-        return request
+            speakers = {}
 
-    @endpoints.method(
-        SpeakerForm,
-        SpeakerForm,
-        path='speaker',
-        http_method='POST',
-        name='createSpeaker')
-    def createSpeaker(self, request):
-        """Create a Speaker."""
-        
-        return self._createSpeakerObject(request)
+            for session in sessions:
 
-    @endpoints.method(
-        CONF_GET_REQUEST,
-        SpeakerForms,
-        path=('getSpeakersByConference/{websafeConferenceKey}'),
-        http_method='GET',
-        name='getSpeakersByConference')
-    def getSpeakersByConference(self, request):
-        """Given a websafeConferenceKey, return all speakers."""
-        
-        # Getting and Verifying current user
-        user = getUser()
+                for webSafeKey in session.speakerKey:
 
-        # Retrieve the Conference key
-        try:
-            
-            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
-        
-        except Exception:
-        
-            raise endpoints.BadRequestException(
-                'The websafeConferenceKey is invalid.')
-        
-        # Verify that the conference exists
-        conference = c_key.get()
+                    spkr_key = ndb.Key(urlsafe=webSafeKey)
 
-        checkObj(conference, 'Conference')
+                    speakers[spkr_key] = entities[spkr_key]
 
-        # Save the ancestors the Conference obj
-        sessions = Session.query(ancestor=c_key)
-        
-        # Retrieve Speaker Keys from each Session in a Conference
-        speakerKeys = set()
+            # the speakers' session lists are other entity groups, a task
+            # queued with the transaction writes them
+            try:
+                featured_changed |= self._putSessionObjects(
+                    c_key, sessions, speakers, listed=False)
+            except (datastore_errors.TransactionFailedError,
+                    datastore_errors.BadRequestError):
+                for result, data in chunk:
+                    result.error = 'The session could not be stored.'
+                continue
 
-        for sess in sessions:
-            
-            for webSafeKey in sess.speakerKey:
-                
-                speaker_key = ndb.Key(urlsafe=webSafeKey)
-                
-                # add to set
-                speakerKeys.add(speaker_key)
+            for (result, data), session in zip(chunk, sessions):
 
-        # Container to keep speaker objects
-        speakers = []
-        
-        # Get each speaker and add to the set
-        for spk in speakerKeys:
-            
-            speaker = spk.get()
+                result.websafeKey = session.key.urlsafe()
 
-            speakers.append(speaker)
+            created.extend(sessions)
 
-        # Return one or many SpeakerForms for Speakers
-        return SpeakerForms(
-            items = [self._copySpeakerToForm(
-                spkr) for spkr in speakers])
+        if created:
 
-# - - - Featured Speakers - - - - - - - - - - - - - - - - - - - -
+            # cached session lists of the conference are now stale
+            self._bumpConference(c_key, catalog=False)
 
-    @staticmethod
-    def _cacheFeaturedSpeaker(self, request):
-        """Finds the featured Speaker and adds the speaker 
-        to the memcache."""
+        # Advise of the featured Speakers using the taskQueue
+        if featured_changed:
+            tasks.add(
+                params = {'websafeConferenceKey': c_key.urlsafe()},
+                url    = '/tasks/set_featured_speaker',
+                method = 'GET')
 
+        return created
 
+    @endpoints.method(
+        SpeakerForms,
+        BatchResultForms,
+        path='speakers/batch',
+        http_method='POST',
+        name='createSpeakers')
+    @recordMetrics
+    def createSpeakers(self, request):
+        """Create many speakers at once; each item is reported on
+        separately."""
 
-        # Retrieve the Conference key
-        try:
-            
-            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
-        
-        except Exception:
-        
-            raise endpoints.BadRequestException(
-                'The websafeConferenceKey is invalid.')
-        
-        # Verify that the conference exists
-        conference = c_key.get()
+        user = getUser()
 
-        checkObj(conference, 'Conference')
+        results = self._batchResults(request.items)
 
-        # Store the Sessions that are ancestors of the Conference
-        sessions = Session.query(ancestor=c_key)
+        valid = []
 
-        # Retrieve Speaker Keys from each Session in a Conference
-        speakerKeys = set()
+        for result, form in zip(results, request.items):
 
+            try:
+                valid.append((result, self._speakerData(form)))
+            except endpoints.ServiceException as e:
+                result.error = str(e)
 
+        if valid:
 
+            # speaker ids come from the same sequence createSpeaker uses
+            first, last = Session.allocate_ids(size=len(valid))
 
+            speakers = []
 
+            for s_id, (result, data) in zip(range(first, last + 1), valid):
 
-        #memcache.set(MEMCACHE_FEATURED_SPEAKER_KEY, featured)
-        return featured
+                data['key'] = ndb.Key(Speaker, s_id)
 
-    @endpoints.method(
-        GET_FEATURED_SPEAKER,
-        StringMessage,
-        path='getFeaturedSpeaker/{websafeConferenceKey}',
-        http_method='GET',
-        name='getFeaturedSpeaker')
-    def getFeaturedSpeaker(self, request):
-        """Return Featured Speaker from memcache."""
+                result.websafeKey = data['key'].urlsafe()
 
-        # Getting and Verifying current user
-        user = getUser()
-        
-        # return an existing Featured Speaker from Memcache or an empty string.
-        featured = memcache.get(MEMCACHE_FEATURED_SPEAKER_KEY)
-        if not featured:
-            featured = ""
-        return StringMessage(data=featured)
+                speakers.append(Speaker(**data))
+
+            tasks = TaskBatch()
+
+            self._sendBatchSummary(
+                tasks, user, 'Speakers', [spkr.name for spkr in speakers])
+
+            # the summary is only queued once the speakers are stored
+            ndb.put_multi(speakers)
+
+            tasks.flush()
+
+        return BatchResultForms(items=results)
 
 # - - - Registration - - - - - - - - - - - - - - - - - - - -
 
-    @ndb.transactional(xg=True)
     def _conferenceRegistration(self, request, reg=True):
         """Register or unregister user for selected conference."""
         
@@ -1049,75 +2425,547 @@ class ConferenceApi(remote.Service):
         # get the conference object.
         conf = ndb.Key(urlsafe=wsck).get()
         
-              # Check if the conf was retrieved
+        # Check if the conf was retrieved
         checkObj(conf, 'Conference')
 
+        # Conferences created before seats were sharded get sharded now
+        if not conf.seatShards:
+            conf = self._shardSeats(conf.key)
+
+        shard_keys = self._seatShardKeys(conf.key, conf.seatShards)
+
         # register
         if reg:
             # check if user already registered otherwise add
-            if wsck in prof.conferenceKeysToAttend:
+            if self._isRegistered(prof, conf.key):
                 raise ConflictException(
                     "You have already registered for this conference")
+            retval = self._registerSeat(prof.key, shard_keys, wsck)
             # check if seats avail
-            if conf.seatsAvailable <= 0:
+            if not retval:
                 raise ConflictException(
                     "There are no seats available.")
-            # register user, take away one seat
-            prof.conferenceKeysToAttend.append(wsck)
-            conf.seatsAvailable -= 1
-            retval = True
         # unregister
         else:
-            # check if user already registered
-            if wsck in prof.conferenceKeysToAttend:
-
-                # unregister user, add back one seat
-                prof.conferenceKeysToAttend.remove(wsck)
-                conf.seatsAvailable += 1
-                retval = True
-            else:
-                retval = False
-        # write things back to the datastore & return
-        prof.put()
-        conf.put()
+            retval = self._releaseSeat(
+                prof.key, random.choice(shard_keys), wsck)
+        # refresh Conference.seatsAvailable shortly & return
+        if retval:
+            self._scheduleSeatSync(wsck)
         return BooleanMessage(data=retval)
 
+    def _registerSeat(self, p_key, shard_keys, wsck):
+        """Take a seat for a user from one of a Conference's SeatShards;
+        returns False when none has seats left. Raises ConflictException
+        when seats remain but every shard tried was too contended."""
+        # try the shards that still have seats, in random order so
+        # that concurrent registrations spread over the shards
+        shards = [shard for shard in ndb.get_multi(shard_keys)
+                  if shard and shard.seats > 0]
+        random.shuffle(shards)
+        contended = False
+        for shard in shards:
+            try:
+                if self._takeSeat(p_key, shard.key, wsck):
+                    return True
+            except datastore_errors.TransactionFailedError:
+                # too much contention on this shard, try the next one
+                contended = True
+        # seats were left, the user should simply try again
+        if contended:
+            raise ConflictException(
+                "Registration is busy right now, please try again.")
+        return False
+
+    @ndb.transactional(xg=True)
+    def _takeSeat(self, p_key, shard_key, wsck):
+        """Take a seat from a SeatShard and register the user; returns
+        False when the shard has no seats left."""
+        c_key = ndb.Key(urlsafe=wsck)
+        prof, shard, registration = ndb.get_multi(
+            [p_key, shard_key, self._registrationKey(p_key, c_key)])
+        # check if user already registered otherwise add
+        if registration or wsck in prof.conferenceKeysToAttend:
+            raise ConflictException(
+                "You have already registered for this conference")
+        # a shard never goes below zero, so seats are never overbooked
+        if shard.seats <= 0:
+            return False
+        # register user, take away one seat; the Profile is not rewritten
+        shard.seats -= 1
+        ndb.put_multi([self._newRegistration(p_key, c_key), shard])
+        return True
+
+    @ndb.transactional(xg=True)
+    def _releaseSeat(self, p_key, shard_key, wsck):
+        """Unregister the user and give their seat back to a SeatShard;
+        returns False when the user was not registered."""
+        r_key = self._registrationKey(p_key, ndb.Key(urlsafe=wsck))
+        prof, shard, registration = ndb.get_multi([p_key, shard_key, r_key])
+        # unregister user, whether or not their registration was migrated
+        if registration:
+            r_key.delete()
+        elif wsck in prof.conferenceKeysToAttend:
+            prof.conferenceKeysToAttend.remove(wsck)
+            prof.put()
+        else:
+            return False
+        # add back one seat
+        shard.seats += 1
+        shard.put()
+        return True
+
+    @staticmethod
+    def _registrationKey(p_key, c_key):
+        """Return the key of a Profile's Registration for a Conference."""
+        return ndb.Key(Registration, c_key.urlsafe(), parent=p_key)
+
+    @staticmethod
+    def _newRegistration(p_key, c_key):
+        """Return a Registration of a Profile for a Conference."""
+        return Registration(key=ConferenceApi._registrationKey(p_key, c_key),
+                            conferenceKey=c_key)
+
+    def _isRegistered(self, prof, c_key):
+        """Return whether the user of a Profile is registered for a
+        Conference."""
+        return (c_key.urlsafe() in prof.conferenceKeysToAttend or
+                self._registrationKey(prof.key, c_key).get() is not None)
+
+    @ndb.tasklet
+    def _attendingConferenceKeysAsync(self, prof):
+        """Return the keys of the Conferences the user of a Profile is
+        registered for (tasklet)."""
+        r_keys = yield Registration.query(ancestor=prof.key).fetch_async(
+            keys_only=True)
+        c_keys = [ndb.Key(urlsafe=r_key.id()) for r_key in r_keys]
+        # registrations the migration has not moved yet
+        migrated = set(r_key.id() for r_key in r_keys)
+        raise ndb.Return(c_keys + [
+            ndb.Key(urlsafe=wsck) for wsck in prof.conferenceKeysToAttend
+            if wsck not in migrated])
+
+    @ndb.tasklet
+    def _wishlistSessionKeysAsync(self, prof):
+        """Return the websafe keys of the Sessions on the wishlist of a
+        Profile (tasklet)."""
+        e_keys = yield WishlistEntry.query(ancestor=prof.key).fetch_async(
+            keys_only=True)
+        wssks = [e_key.id() for e_key in e_keys]
+        # entries the migration has not moved yet
+        listed = set(wssks)
+        raise ndb.Return(wssks + [
+            wssk for wssk in prof.sessionWishList if wssk not in listed])
+
+    @staticmethod
+    def _migrateRegistrations(pageToken=None):
+        """Move the legacy conferenceKeysToAttend of a batch of Profiles
+        into Registration children, queueing the next batch until all are
+        done."""
+        profiles, nextPageToken = fetchPage(
+            Profile.query(), REGISTRATION_MIGRATION_BATCH, pageToken)
+        for prof in profiles:
+            if prof.conferenceKeysToAttend:
+                ConferenceApi._migrateProfileRegistrations(prof.key)
+        if nextPageToken:
+            taskqueue.add(
+                params = {'pageToken': nextPageToken},
+                url    = '/tasks/migrate_registrations')
+
+    @staticmethod
+    @ndb.transactional()
+    def _migrateProfileRegistrations(p_key):
+        """Move one Profile's legacy registrations into Registration
+        children; both live in the Profile's entity group."""
+        prof = p_key.get()
+        if not prof.conferenceKeysToAttend:
+            return
+        registrations = [
+            ConferenceApi._newRegistration(p_key, ndb.Key(urlsafe=wsck))
+            for wsck in set(prof.conferenceKeysToAttend)]
+        prof.conferenceKeysToAttend = []
+        ndb.put_multi([prof] + registrations)
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _shardSeats(c_key):
+        """Move the seats of a Conference that predates seat sharding into
+        SeatShards, returning the updated Conference."""
+        conf = c_key.get()
+        if not conf.seatShards:
+            seats = max(conf.seatsAvailable or 0, 0)
+            conf.seatShards = ConferenceApi._seatShardCount(seats)
+            ndb.put_multi([conf] + ConferenceApi._newSeatShards(
+                c_key, conf.seatShards, seats))
+        return conf
+
+    @staticmethod
+    def _resizeSeats(conf, maxAttendees):
+        """Move a Conference to a new maxAttendees, spreading the seats it
+        leaves over its SeatShards; run in a cross-group transaction with
+        the Conference, which the caller stores."""
+        if conf.seatShards:
+            shards = ndb.get_multi(
+                ConferenceApi._seatShardKeys(conf.key, conf.seatShards))
+            seats = sum(shard.seats for shard in shards if shard)
+        else:
+            seats = max(conf.seatsAvailable or 0, 0)
+        registered = (conf.maxAttendees or 0) - seats
+        seats = maxAttendees - registered
+        if seats < 0:
+            raise endpoints.BadRequestException(
+                'maxAttendees can not be below the %d attendees registered.'
+                % registered)
+        was_nearly_sold_out = ConferenceApi._isNearlySoldOut(conf)
+        conf.maxAttendees = maxAttendees
+        conf.seatsAvailable = seats
+        if conf.seatShards:
+            ndb.put_multi(ConferenceApi._newSeatShards(
+                conf.key, conf.seatShards, seats))
+        if ConferenceApi._isNearlySoldOut(conf) != was_nearly_sold_out:
+            ConferenceApi._updateNearlySoldOut(conf)
+
+    @staticmethod
+    @ndb.tasklet
+    def _seatsLeftAsync(conf):
+        """Return the seats left at a Conference, the sum of its SeatShards
+        (tasklet)."""
+        if not conf.seatShards:
+            raise ndb.Return(max(conf.seatsAvailable or 0, 0))
+        shards = yield ndb.get_multi_async(
+            ConferenceApi._seatShardKeys(conf.key, conf.seatShards))
+        raise ndb.Return(sum(shard.seats for shard in shards if shard))
+
+    @staticmethod
+    def _seatShardCount(seats):
+        """Return the number of SeatShards to spread seats over."""
+        return max(1, min(SEAT_SHARDS, seats))
+
+    @staticmethod
+    def _seatShardKeys(c_key, count):
+        """Return the keys of a Conference's SeatShards."""
+        return [ndb.Key(SeatShard, '%s-%d' % (c_key.urlsafe(), i))
+                for i in range(count)]
+
+    @staticmethod
+    def _newSeatShards(c_key, count, seats):
+        """Return count SeatShards of a Conference sharing seats evenly."""
+        return [SeatShard(key=shard_key,
+                          seats=seats // count + (1 if i < seats % count else 0))
+                for i, shard_key in enumerate(
+                    ConferenceApi._seatShardKeys(c_key, count))]
+
+    @staticmethod
+    def _scheduleSeatSync(wsck):
+        """Queue a refresh of Conference.seatsAvailable at the end of the
+        current SEAT_SYNC_DELAY window; one task per window is enough."""
+        addTaskOncePerWindow(
+            'seats-%s' % wsck, SEAT_SYNC_DELAY,
+            params = {'websafeConferenceKey': wsck},
+            url    = '/tasks/sync_seats_available')
+
+    @staticmethod
+    def _syncSeatsAvailable(websafeConferenceKey):
+        """Set Conference.seatsAvailable to the sum of its SeatShards."""
+        c_key = ndb.Key(urlsafe=websafeConferenceKey)
+        conf = c_key.get()
+        if not conf or not conf.seatShards:
+            return
+        shards = ndb.get_multi(
+            ConferenceApi._seatShardKeys(c_key, conf.seatShards))
+        ConferenceApi._setSeatsAvailable(
+            c_key, sum(shard.seats for shard in shards if shard))
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _setSeatsAvailable(c_key, seats):
+        """Store the seats available on a Conference, updating the
+        NearlySoldOut set when the count crosses its threshold."""
+        conf = c_key.get()
+        if conf.seatsAvailable != seats:
+            was_nearly_sold_out = ConferenceApi._isNearlySoldOut(conf)
+            conf.seatsAvailable = seats
+            conf.put()
+            if ConferenceApi._isNearlySoldOut(conf) != was_nearly_sold_out:
+                ConferenceApi._updateNearlySoldOut(conf)
+            # cached responses show the old seat count until this commits
+            ndb.get_context().call_on_commit(
+                lambda: ConferenceApi._bumpConference(c_key))
+
+    @ndb.tasklet
+    def _conferencesToAttendAsync(self):
+        """Return ConferenceForms the user is registered for (tasklet)."""
+        prof = yield self._getProfileFromUserAsync()  # get user Profile
+        # a keys-only query of the Profile's Registrations
+        conf_keys = yield self._attendingConferenceKeysAsync(prof)
+        conferences = yield ndb.get_multi_async(conf_keys)
+        # return set of ConferenceForm objects per Conference
+        forms = yield self._conferenceFormsAsync(
+            [conf for conf in conferences if conf])
+        raise ndb.Return(forms)
+
     @endpoints.method(message_types.VoidMessage, ConferenceForms,
                       path        = 'conferences/attending',
                       http_method = 'GET',
                       name        = 'getConferencesToAttend')
+    @recordMetrics
     def getConferencesToAttend(self, request):
         """Get list of conferences that user has registered for."""
-        prof = self._getProfileFromUser()  # get user Profile
-        conf_keys = [ndb.Key(urlsafe=wsck) for wsck in
-                     prof.conferenceKeysToAttend]
-        conferences = ndb.get_multi(conf_keys)
-        # get organizers
-        organisers = [ndb.Key(Profile, conf.organizerUserId) for conf in
-                      conferences]
-        profiles = ndb.get_multi(organisers)
-        # put display names in a dict for easier fetching
-        names = {}
-        for profile in profiles:
-            names[profile.key.id()] = profile.displayName
-        # return set of ConferenceForm objects per Conference
-        return ConferenceForms(
-            items=[self._copyConferenceToForm(
-                conf, names[conf.organizerUserId])
-                for conf in conferences])
+        return self._conferencesToAttendAsync().get_result()
 
-    @endpoints.method(CONF_GET_REQUEST, BooleanMessage,
+    @endpoints.method(CONF_GET_REQUEST, RegistrationForm,
                       path        = 'conference/{websafeConferenceKey}',
                       http_method = 'POST',
                       name        = 'registerForConference')
+    @recordMetrics
     def registerForConference(self, request):
-        """Register user for selected conference."""
-        return self._conferenceRegistration(request)
+        """Register user for selected conference. Registrations for high
+        demand conferences are queued and a pending ticket is returned."""
+        conf = ndb.Key(urlsafe=request.websafeConferenceKey).get()
+        checkObj(conf, 'Conference')
+        if conf.highDemand:
+            return self._queueRegistration(conf)
+        return RegistrationForm(
+            data=self._conferenceRegistration(request).data,
+            status=RegistrationStatus.REGISTERED,
+            websafeConferenceKey=request.websafeConferenceKey)
+
+    @endpoints.method(REGISTRATION_GET_REQUEST, RegistrationForm,
+                      path        = 'registration/{websafeTicketKey}',
+                      http_method = 'GET',
+                      name        = 'getRegistrationStatus')
+    @recordMetrics
+    def getRegistrationStatus(self, request):
+        """Return the status of a queued registration."""
+        prof = self._getProfileFromUser()
+        try:
+            t_key = ndb.Key(urlsafe=request.websafeTicketKey)
+        except Exception:
+            raise endpoints.BadRequestException(
+                'The websafeTicketKey given is invalid.')
+        # tickets are children of the Profile that queued them
+        if t_key.kind() != 'RegistrationTicket' or t_key.parent() != prof.key:
+            raise endpoints.NotFoundException(
+                'No registration found with the key provided.')
+        ticket = t_key.get()
+        checkObj(ticket, 'registration')
+        return self._copyTicketToForm(ticket)
+
+    @endpoints.method(ATTENDEES_GET_REQUEST, AttendeeForms,
+                      path        = 'conference/{websafeConferenceKey}/'
+                                    'attendees',
+                      http_method = 'GET',
+                      name        = 'getAttendeesByConference')
+    @recordMetrics
+    def getAttendeesByConference(self, request):
+        """Return a page of a conference's attendees and how many there
+        are; only the conference's organiser may ask."""
+        user_id = getUserId(getUser())
+        try:
+            c_key = ndb.Key(urlsafe=request.websafeConferenceKey)
+        except Exception:
+            raise endpoints.BadRequestException(
+                'The websafeConferenceKey given is invalid.')
+        conf = c_key.get()
+        checkObj(conf, 'Conference')
+        if user_id != conf.organizerUserId:
+            raise endpoints.ForbiddenException(
+                'Only the owner can see the attendees of the Conference.')
+        return self._attendeesAsync(conf, request).get_result()
+
+    @ndb.tasklet
+    def _attendeesAsync(self, conf, request):
+        """Build a page of a Conference's attendees (tasklet). The page is a
+        keys-only query of its Registrations, whose parents are the
+        attendees' Profiles; the total is the seats taken from its
+        SeatShards, read alongside."""
+        query = Registration.query(Registration.conferenceKey == conf.key)
+        page = fetchPageAsync(
+            query, request.pageSize or MAX_PAGE_SIZE, request.pageToken,
+            keys_only=True)
+        seats = self._seatsLeftAsync(conf)
+        (r_keys, nextPageToken), seats = yield page, seats
+        # shards can briefly hold more seats than maxAttendees allows, as
+        # while it is being lowered; never report fewer than no attendees
+        total = max(0, (conf.maxAttendees or 0) - seats)
+        # Profiles only hold display fields, so a batch get of the page
+        # reads no more than a projection would
+        profiles = yield ndb.get_multi_async(
+            [r_key.parent() for r_key in r_keys])
+        # attendees registered before the migration are not listed until
+        # /tasks/migrate_registrations has run
+        raise ndb.Return(AttendeeForms(
+            items=[copyToForm(prof, AttendeeForm)
+                   for prof in profiles if prof],
+            nextPageToken=nextPageToken,
+            total=total))
+
+# - - - Queued Registration - - - - - - - - - - - - - - - - - - - -
+
+    def _copyTicketToForm(self, ticket):
+        """Copy relevant fields from RegistrationTicket to RegistrationForm.
+        """
+        return RegistrationForm(
+            data=ticket.status == str(RegistrationStatus.REGISTERED),
+            status=getattr(RegistrationStatus, ticket.status),
+            websafeTicketKey=ticket.key.urlsafe(),
+            websafeConferenceKey=ticket.conferenceKey.urlsafe(),
+            message=ticket.message)
+
+    def _queueRegistration(self, conf):
+        """Queue a registration for a high demand Conference, returning the
+        pending ticket."""
+        prof = self._getProfileFromUser()
+        wsck = conf.key.urlsafe()
+        # check if user already registered
+        if self._isRegistered(prof, conf.key):
+            raise ConflictException(
+                "You have already registered for this conference")
+        ticket = self._putRegistrationTicket(prof.key, conf.key)
+        # have the queued registrations applied shortly, in one batch
+        addTaskOncePerWindow(
+            'registrations-%s' % wsck, REGISTRATION_BATCH_DELAY,
+            params = {'websafeConferenceKey': wsck},
+            url    = '/tasks/process_registrations')
+        return self._copyTicketToForm(ticket)
+
+    @ndb.transactional()
+    def _putRegistrationTicket(self, p_key, c_key):
+        """Store a pending RegistrationTicket and its pull task; a ticket
+        that is already pending is returned as it is."""
+        t_key = ndb.Key(RegistrationTicket, c_key.urlsafe(), parent=p_key)
+        ticket = t_key.get()
+        if ticket and ticket.status == str(RegistrationStatus.PENDING):
+            return ticket
+        ticket = RegistrationTicket(key=t_key, conferenceKey=c_key)
+        ticket.put()
+        # tagged by conference so a worker can lease one conference's batch
+        tasks = TaskBatch(REGISTRATION_QUEUE)
+        tasks.add(payload=t_key.urlsafe(), method='PULL', tag=c_key.urlsafe())
+        tasks.flush(transactional=True)
+        return ticket
+
+    @staticmethod
+    def _processRegistrations(websafeConferenceKey=None):
+        """Lease queued registrations in batches and apply them; without a
+        websafeConferenceKey, batches of whichever conference queued first
+        are leased."""
+        queue = taskqueue.Queue(REGISTRATION_QUEUE)
+        deadline = time.time() + REGISTRATION_WORK_SECONDS
+        while time.time() < deadline:
+            tasks = queue.lease_tasks_by_tag(
+                REGISTRATION_LEASE_SECONDS, REGISTRATION_LEASE_TASKS,
+                tag=websafeConferenceKey)
+            if not tasks:
+                break
+            ConferenceApi._applyRegistrationBatch(queue, tasks)
+
+    @staticmethod
+    def _applyRegistrationBatch(queue, tasks):
+        """Apply a leased batch of one Conference's registrations, first
+        come first served, a few transactions at a time."""
+        wsck = tasks[0].tag
+        c_key = ndb.Key(urlsafe=wsck)
+        conf = c_key.get()
+        if conf is None:
+            queue.delete_tasks(tasks)
+            return
+        if not conf.seatShards:
+            conf = ConferenceApi._shardSeats(c_key)
+        shard_keys = ConferenceApi._seatShardKeys(c_key, conf.seatShards)
+        # tasks are leased oldest first
+        pending = list(tasks)
+        while pending:
+            shards = sorted(
+                [shard for shard in ndb.get_multi(shard_keys)
+                 if shard and shard.seats > 0],
+                key=lambda shard: -shard.seats)
+            if not shards:
+                ConferenceApi._rejectRegistrations(
+                    [ndb.Key(urlsafe=task.payload) for task in pending],
+                    'There are no seats available.')
+                queue.delete_tasks(pending)
+                break
+            # as many shards as it takes to seat the chunk, within the
+            # entity group limit of a cross-group transaction
+            chunk = pending[:REGISTRATION_TXN_SIZE]
+            use, seats = [], 0
+            for shard in shards:
+                if seats >= len(chunk) or len(use) + len(chunk) >= MAX_XG_GROUPS:
+                    break
+                use.append(shard.key)
+                seats += shard.seats
+            chunk = chunk[:MAX_XG_GROUPS - len(use)]
+            left = ConferenceApi._applyRegistrations(
+                [ndb.Key(urlsafe=task.payload) for task in chunk], use)
+            queue.delete_tasks(
+                [task for task in chunk if task.payload not in left])
+            pending = ([task for task in chunk if task.payload in left] +
+                       pending[len(chunk):])
+        ConferenceApi._scheduleSeatSync(wsck)
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _applyRegistrations(ticket_keys, shard_keys):
+        """Seat the users of pending tickets from the given SeatShards in
+        ticket order. Returns the websafe keys of the tickets left pending
+        because these shards ran out of seats."""
+        # a ticket queued more than once in the chunk is seated once
+        ticket_keys = list(collections.OrderedDict.fromkeys(ticket_keys))
+        # a ticket is keyed like the Registration it turns into
+        registration_keys = [
+            ndb.Key(Registration, t_key.id(), parent=t_key.parent())
+            for t_key in ticket_keys]
+        n = len(ticket_keys)
+        entities = ndb.get_multi(
+            shard_keys + ticket_keys + [t_key.parent() for t_key in ticket_keys]
+            + registration_keys)
+        shards = entities[:len(shard_keys)]
+        tickets = entities[len(shard_keys):len(shard_keys) + n]
+        profiles = entities[len(shard_keys) + n:len(shard_keys) + 2 * n]
+        registrations = entities[len(shard_keys) + 2 * n:]
+        left, to_put = [], []
+        for ticket, prof, registration in zip(tickets, profiles,
+                                              registrations):
+            if ticket is None or ticket.status != str(RegistrationStatus.PENDING):
+                continue
+            wsck = ticket.conferenceKey.urlsafe()
+            if (prof is None or registration or
+                    wsck in prof.conferenceKeysToAttend):
+                ticket.status = str(RegistrationStatus.REJECTED)
+                ticket.message = (
+                    "You have already registered for this conference")
+            else:
+                shard = next((s for s in shards if s and s.seats > 0), None)
+                if shard is None:
+                    left.append(ticket.key.urlsafe())
+                    continue
+                # register user, take away one seat
+                shard.seats -= 1
+                ticket.status = str(RegistrationStatus.REGISTERED)
+                to_put.append(ConferenceApi._newRegistration(
+                    prof.key, ticket.conferenceKey))
+            to_put.append(ticket)
+        if to_put:
+            ndb.put_multi(to_put + [shard for shard in shards if shard])
+        return left
+
+    @staticmethod
+    def _rejectRegistrations(ticket_keys, message):
+        """Mark the pending tickets among ticket_keys as rejected."""
+        tickets = [ticket for ticket in ndb.get_multi(ticket_keys)
+                   if ticket and
+                   ticket.status == str(RegistrationStatus.PENDING)]
+        for ticket in tickets:
+            ticket.status = str(RegistrationStatus.REJECTED)
+            ticket.message = message
+        ndb.put_multi(tickets)
 
     @endpoints.method(CONF_GET_REQUEST, BooleanMessage,
                       path        = 'conference/{websafeConferenceKey}',
                       http_method = 'DELETE',
                       name        = 'unregisterFromConference')
+    @recordMetrics
     def unregisterFromConference(self, request):
         """Unregister user for selected conference."""
         return self._conferenceRegistration(request, reg=False)
@@ -1125,109 +2973,240 @@ class ConferenceApi(remote.Service):
 # - - - Announcements - - - - - - - - - - - - - - - - - - - -
 
     @staticmethod
-    def _cacheAnnouncement():
-        """Create Announcement & assign to memcache.
-        """
-        confs = Conference.query(ndb.AND(
-            Conference.seatsAvailable <= 5,
-            Conference.seatsAvailable > 0)
-        ).fetch(projection=[Conference.name])
-        if confs:
+    def _isNearlySoldOut(conf):
+        """Return whether a Conference belongs in the NearlySoldOut set."""
+        return 0 < (conf.seatsAvailable or 0) <= NEARLY_SOLD_OUT_SEATS
+
+    @staticmethod
+    def _nearlySoldOutKey():
+        """Return the key of the NearlySoldOut set."""
+        return ndb.Key(NearlySoldOut, NEARLY_SOLD_OUT_ID)
+
+    @staticmethod
+    def _updateNearlySoldOut(conf):
+        """Add a Conference to, or drop it from, the NearlySoldOut set; run
+        in the transaction that changed its seatsAvailable."""
+        nearly = (ConferenceApi._nearlySoldOutKey().get() or
+                  NearlySoldOut(key=ConferenceApi._nearlySoldOutKey()))
+        nearly.conferences = [entry for entry in nearly.conferences
+                              if entry.conferenceKey != conf.key]
+        if ConferenceApi._isNearlySoldOut(conf):
+            nearly.conferences.append(
+                AnnouncedConference(conferenceKey=conf.key, name=conf.name))
+        nearly.put()
+        ndb.get_context().call_on_commit(
+            lambda: ConferenceApi._setAnnouncement(nearly))
+
+    @staticmethod
+    def _setAnnouncement(nearly):
+        """Format the announcement of a NearlySoldOut set (None when there
+        is none yet) & assign to memcache."""
+        names = [entry.name for entry in nearly.conferences] if nearly else []
+        if names:
             # If there are almost sold out conferences,
             # format announcement and set it in memcache
             announcement = '%s %s' % (
                 'Last chance to attend! The following conferences '
                 'are nearly sold out:',
-                ', '.join(conf.name for conf in confs))
-            memcache.set(MEMCACHE_ANNOUNCEMENTS_KEY, announcement)
+                ', '.join(names))
         else:
-            # If there are no sold out conferences,
-            # delete the memcache announcements entry
+            # If there are no sold out conferences, cache the empty
+            # announcement so that readers do not keep missing the cache
             announcement = ""
-            memcache.delete(MEMCACHE_ANNOUNCEMENTS_KEY)
+        cacheSet(MEMCACHE_ANNOUNCEMENTS_KEY, announcement)
         return announcement
 
+    @staticmethod
+    def _cacheAnnouncement():
+        """Reconcile the NearlySoldOut set with the conferences' seat counts
+        & assign the announcement to memcache. Seat changes keep the set up
+        to date, so this only repairs drift (e.g. renamed conferences).
+        """
+        confs = Conference.query(ndb.AND(
+            Conference.seatsAvailable <= NEARLY_SOLD_OUT_SEATS,
+            Conference.seatsAvailable > 0)
+        ).fetch(projection=[Conference.name])
+        listed = {conf.key: conf.name for conf in confs}
+        nearly = ConferenceApi._nearlySoldOutKey().get()
+        announced = {entry.conferenceKey: entry.name
+                     for entry in (nearly.conferences if nearly else [])}
+        # the query is eventually consistent, so it only points at the
+        # conferences to check again; order does not matter
+        drifted = [c_key for c_key in set(listed) | set(announced)
+                   if listed.get(c_key) != announced.get(c_key)]
+        # a few conferences per cross-group transaction, with the set
+        for start in range(0, len(drifted), MAX_XG_GROUPS - 1):
+            nearly = ConferenceApi._reconcileNearlySoldOut(
+                drifted[start:start + MAX_XG_GROUPS - 1])
+        return ConferenceApi._setAnnouncement(nearly)
+
+    @staticmethod
+    @ndb.transactional(xg=True)
+    def _reconcileNearlySoldOut(c_keys):
+        """Add Conferences to, or drop them from, the NearlySoldOut set
+        from their current seat counts, returning the set."""
+        nearly_key = ConferenceApi._nearlySoldOutKey()
+        entities = ndb.get_multi([nearly_key] + c_keys)
+        nearly = entities[0] or NearlySoldOut(key=nearly_key)
+        current = dict(zip(c_keys, entities[1:]))
+        conferences = [entry for entry in nearly.conferences
+                       if entry.conferenceKey not in current]
+        conferences.extend(
+            AnnouncedConference(conferenceKey=c_key, name=conf.name)
+            for c_key, conf in current.items()
+            if conf and ConferenceApi._isNearlySoldOut(conf))
+        # compared as sets, entries are appended in no particular order
+        if ({(entry.conferenceKey, entry.name) for entry in conferences} !=
+                {(entry.conferenceKey, entry.name)
+                 for entry in nearly.conferences}):
+            nearly.conferences = conferences
+            nearly.put()
+        return nearly
+
     @endpoints.method(message_types.VoidMessage, StringMessage,
                       path        = 'conference/announcement/get',
                       http_method = 'GET',
                       name        = 'getAnnouncement')
+    @recordMetrics
     def getAnnouncement(self, request):
-        """Return Announcement from memcache."""
-        # return an existing announcement from Memcache or an empty string.
-        announcement = memcache.get(MEMCACHE_ANNOUNCEMENTS_KEY)
-        if not announcement:
-            announcement = ""
+        """Return Announcement from the instance cache or memcache."""
+        # return an existing announcement from the cache or an empty string.
+        announcement = cacheGet(MEMCACHE_ANNOUNCEMENTS_KEY)
+        # on a miss, one read of the NearlySoldOut set refills the cache
+        if announcement is None:
+            announcement = self._setAnnouncement(
+                self._nearlySoldOutKey().get())
         return StringMessage(data=announcement)
 
 # - - - wishList methods - - - - - - - - - - - - - - - - - - -
 
-    def _sessionWishlist(self, request, add=True):
-        """Add or remove a session to a User's wishlist."""
+    @ndb.tasklet
+    def _sessionWishlistAsync(self, request, add=True):
+        """Add or remove a session to a User's wishlist (tasklet)."""
         retval = None
         # Ensure that user is authed
         user = endpoints.get_current_user()
         if not user:
             raise endpoints.UnauthorizedException('Authorization Required')
-        # Get user's profile
-        prof = self._getProfileFromUser()
         # Get Session being passed
         try:
             sesh_key = ndb.Key(urlsafe=request.webSafeSessionKey)
         except Exception:
             raise endpoints.BadRequestException(
                 'The websafeSessionKey given is invalid.')
-        session = sesh_key.get()
+        # Get user's profile and the Session together
+        prof, session = yield (self._getProfileFromUserAsync(),
+                               sesh_key.get_async())
         # Throw Not Found Error if no Session found
-        if not sesh_key:
+        if not session:
             raise endpoints.NotFoundException(
                 'No session found with key: {0}'.format(sesh_key))
-        # Get Session parent key and associated Conference
-        conference = session.key.parent().get()
-        conf_key = conference.key.urlsafe()
-        # Ensure that conference is in User's conferenceKeysToAttend
-        if conf_key not in prof.conferenceKeysToAttend:
+        # The Session's parent key is its Conference key
+        conf_key = sesh_key.parent().urlsafe()
+        # Ensure that the User is registered for the conference
+        registration = yield self._registrationKey(
+            prof.key, sesh_key.parent()).get_async()
+        if not registration and conf_key not in prof.conferenceKeysToAttend:
             raise ConflictException(
                 "You must be register for the parent confernce before adding "
                 "a session to your wishlist.")
+        # a Profile still holding the legacy list is moved over first
+        yield self._migrateWishlistsAsync([prof])
+        # the wishlist entry is found by key, whatever the list's length
+        entry_key = ndb.Key(WishlistEntry, sesh_key.urlsafe(),
+                            parent=prof.key)
+        entry = yield entry_key.get_async()
         if add:
             # Check if session is already in wishlist
-            if request.webSafeSessionKey in prof.sessionWishList:
+            if entry:
                 raise ConflictException(
                     "This Session is already in your wishlist.")
             # Add session to User's wishlist
-            prof.sessionWishList.append(request.webSafeSessionKey)
+            yield WishlistEntry(key=entry_key).put_async()
             retval = True
         else:
             # Check if session is already in wishlist
-            if request.webSafeSessionKey in prof.sessionWishList:
+            if entry:
                 # Remove Session from User's wishlist
-                prof.sessionWishList.remove(request.webSafeSessionKey)
+                yield entry_key.delete_async()
                 retval = True
             else:
                 retval = False
-        prof.put()
-        return BooleanMessage(data=retval)
+        raise ndb.Return(BooleanMessage(data=retval))
+
+    def _sessionWishlist(self, request, add=True):
+        """Add or remove a session to a User's wishlist."""
+        return self._sessionWishlistAsync(request, add).get_result()
+
+    @ndb.tasklet
+    def _sessionWishlistFormsAsync(self, request):
+        """Return SessionForms of a page of the current user's wishlist
+        (tasklet)."""
+        # Get user's profile
+        prof = yield self._getProfileFromUserAsync()
+        yield self._migrateWishlistsAsync([prof])
+        # a keys-only page of the Profile's WishlistEntry children
+        entry_keys, nextPageToken = yield fetchPageAsync(
+            WishlistEntry.query(ancestor=prof.key),
+            request.pageSize or MAX_PAGE_SIZE, request.pageToken,
+            keys_only=True)
+        sessions = yield ndb.get_multi_async(
+            [ndb.Key(urlsafe=e_key.id()) for e_key in entry_keys])
+        # return set of SessionForm objects per Session
+        raise ndb.Return(SessionForms(
+            items=[self._copyConferenceSessionToForm(
+                sesh) for sesh in sessions if sesh],
+            nextPageToken=nextPageToken))
+
+    @staticmethod
+    @ndb.tasklet
+    def _migrateWishlistsAsync(profiles):
+        """Move the legacy sessionWishList of Profiles into WishlistEntry
+        children (tasklet), one transaction per Profile."""
+        yield [ConferenceApi._migrateProfileWishlistAsync(prof.key)
+               for prof in profiles if prof.sessionWishList]
+
+    @staticmethod
+    @ndb.transactional_tasklet()
+    def _migrateProfileWishlistAsync(p_key):
+        """Move one Profile's legacy wishlist into WishlistEntry children
+        (tasklet); both live in the Profile's entity group, so the Profile
+        is read again here rather than trusted from a query."""
+        prof = yield p_key.get_async()
+        if not prof or not prof.sessionWishList:
+            return
+        entries = [WishlistEntry(id=wssk, parent=p_key)
+                   for wssk in set(prof.sessionWishList)]
+        prof.sessionWishList = []
+        yield ndb.put_multi_async([prof] + entries)
 
-    @endpoints.method(message_types.VoidMessage, SessionForms,
+    @staticmethod
+    def _migrateWishlists(pageToken=None):
+        """Move the legacy wishlists of a batch of Profiles into
+        WishlistEntry children, queueing the next batch until all are done.
+        """
+        profiles, nextPageToken = fetchPage(
+            Profile.query(), WISHLIST_MIGRATION_BATCH, pageToken)
+        ConferenceApi._migrateWishlistsAsync(profiles).get_result()
+        if nextPageToken:
+            taskqueue.add(
+                params = {'pageToken': nextPageToken},
+                url    = '/tasks/migrate_wishlists')
+
+    @endpoints.method(WISHLIST_GET_REQUEST, SessionForms,
                       path        = 'view/session_wishlist',
                       http_method = 'GET',
                       name        = 'getSessionWishlist')
+    @recordMetrics
     def getSessionWishlist(self, request):
-        """Get list of sessions in the current user's wishlist."""
-        # Get user's profile
-        prof = self._getProfileFromUser()
-        sesh_keys = [ndb.Key(urlsafe=wssk) for wssk in
-                     prof.sessionWishList]
-        sessions = ndb.get_multi(sesh_keys)
-        # return set of SessionForm objects per Session
-        return SessionForms(
-            items=[self._copyConferenceSessionToForm(
-                sesh) for sesh in sessions])
+        """Get a page of the sessions in the current user's wishlist."""
+        return self._sessionWishlistFormsAsync(request).get_result()
 
     @endpoints.method(SESSION_POST_REQUEST, BooleanMessage,
                       path        = 'sessionToWishlist/{webSafeSessionKey}',
                       http_method = 'POST',
                       name        = 'addSessionToWishlist')
+    @recordMetrics
     def addSessionToWishlist(self, request):
         """Add a session to the User's wishlist."""
         return self._sessionWishlist(request)
@@ -1237,6 +3216,7 @@ class ConferenceApi(remote.Service):
                                     '{webSafeSessionKey}',
                       http_method = 'DELETE',
                       name        = 'removeSessionFromWishlist')
+    @recordMetrics
     def removeSessionFromWishlist(self, request):
         """Remove a session from the User's wishlist."""
         return self._sessionWishlist(request, add=False)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""converters.py
+Conference Central ndb model to ProtoRPC message converters. The plan for
+copying one model into one message is worked out once, from the fields
+the two have in common, and then applied to every entity.
+"""
+
+from protorpc import messages
+from google.appengine.ext import ndb
+
+# Copy plans, {(ndb model class, message class): [(field name, getter)]}
+_PLANS = {}
+
+
+# Returns a getter reading a property of an entity in the form the message
+# field expects.
+def _getter(prop, field):
+    name = field.name
+
+    # Date/Time properties go out as their string representation
+    if (isinstance(prop, (ndb.DateProperty, ndb.TimeProperty,
+                          ndb.DateTimeProperty)) and
+            isinstance(field, messages.StringField)):
+        return lambda entity: str(getattr(entity, name))
+
+    # strings stored from an enumeration go out as the enum value
+    if isinstance(field, messages.EnumField):
+        enum = field.type
+        return lambda entity: getattr(enum, getattr(entity, name))
+
+    # keys go out websafe
+    if (isinstance(prop, ndb.KeyProperty) and
+            isinstance(field, messages.StringField)):
+        if prop._repeated:
+            return lambda entity: [key.urlsafe()
+                                   for key in getattr(entity, name)]
+        return lambda entity: (getattr(entity, name) and
+                                getattr(entity, name).urlsafe())
+
+    return lambda entity: getattr(entity, name)
+
+
+# Works out how to copy a model class into a message class.
+def _buildPlan(model, form):
+    plan = []
+    for field in form.all_fields():
+        prop = getattr(model, field.name, None)
+        if isinstance(prop, ndb.Property):
+            plan.append((field.name, _getter(prop, field)))
+        elif field.name == 'websafeKey':
+            plan.append((field.name, lambda entity: entity.key.urlsafe()))
+    # only forms with required fields need checking once filled in
+    check = any(field.required for field in form.all_fields())
+    _PLANS[(model, form)] = plan, check
+    return plan, check
+
+
+# Copies an entity into a new message of the form class; values left unset
+# (None) are not assigned. Fields given in overrides are taken from there
+# and never read from the entity (e.g. properties a projection left out).
+def copyToForm(entity, form, **overrides):
+    plan, check = _PLANS.get((type(entity), form)) or _buildPlan(
+        type(entity), form)
+    values = {}
+    for name, get in plan:
+        value = overrides[name] if name in overrides else get(entity)
+        if value is not None:
+            values[name] = value
+    message = form(**values)
+    if check:
+        message.check_initialized()
+    return message
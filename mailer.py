@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+"""mailer.py
+Conference Central confirmation emails. Emails are queued as pull tasks
+and sent by a cron job that combines everything queued for a recipient
+since its last run into one digest, sending at most EMAIL_SENDS_PER_RUN
+messages per run.
+"""
+
+import collections
+import json
+import logging
+
+from google.appengine.api import app_identity
+from google.appengine.api import mail
+from google.appengine.api import memcache
+from google.appengine.api import taskqueue
+
+# Pull queue holding the emails waiting to be sent
+EMAIL_QUEUE = 'emails'
+
+# Seconds a run holds the emails it leased; emails it had no send budget
+# left for are leased again by a later run once this expires
+EMAIL_LEASE_SECONDS = 120
+
+# Most emails leased per lease call (the task queue's limit)
+EMAIL_LEASE_TASKS = 1000
+
+# Most emails leased, and most messages sent, by one run
+EMAIL_TASKS_PER_RUN = 5000
+EMAIL_SENDS_PER_RUN = 100
+
+# Leases after which an email that keeps failing to send is dropped
+EMAIL_MAX_ATTEMPTS = 5
+
+# Memcache key of the number of emails left queued after the last run
+EMAIL_BACKLOG_KEY = 'EMAIL_BACKLOG'
+
+
+# Adds an email to a TaskBatch; it goes out with the recipient's next
+# digest.
+def queueEmail(tasks, to, subject, body, info=''):
+    tasks.add(
+        queue_name=EMAIL_QUEUE, method='PULL', tag=to,
+        payload=json.dumps({'email': to, 'subject': subject,
+                            'body': body, 'info': info}))
+
+
+# Formats the fields set on a ProtoRPC message, one per line, for the info
+# part of an email.
+def emailInfo(form):
+    lines = []
+    for field in form.all_fields():
+        value = getattr(form, field.name)
+        if value in (None, []):
+            continue
+        if isinstance(value, list):
+            value = ', '.join(str(v) for v in value)
+        lines.append('%s: %s' % (field.name, value))
+    return '\r\n'.join(lines)
+
+
+# Returns the subject and body of the digest of a recipient's emails.
+def _formatDigest(emails):
+    if len(emails) == 1:
+        subject = emails[0]['subject']
+    else:
+        subject = 'You have %d updates from Conference Central' % len(emails)
+    sections = ['%s\r\n\r\n %s \r\n\r\n %s' % (
+        email['subject'], email['body'], email['info'])
+        for email in emails]
+    return subject, 'Hello there, \r\n\r\n' + '\r\n\r\n'.join(sections)
+
+
+# Leases the queued emails, sends one digest per recipient within the send
+# budget and deletes what was sent. Returns the number of digests sent and
+# the number of emails left queued.
+def sendDigests():
+    queue = taskqueue.Queue(EMAIL_QUEUE)
+
+    leased = []
+    while len(leased) < EMAIL_TASKS_PER_RUN:
+        tasks = queue.lease_tasks(
+            EMAIL_LEASE_SECONDS,
+            min(EMAIL_LEASE_TASKS, EMAIL_TASKS_PER_RUN - len(leased)))
+        if not tasks:
+            break
+        leased.extend(tasks)
+
+    # oldest recipients first
+    by_recipient = collections.OrderedDict()
+    for task in leased:
+        email = json.loads(task.payload)
+        by_recipient.setdefault(email['email'], []).append((task, email))
+
+    sender = 'noreply@%s.appspotmail.com' % (
+        app_identity.get_application_id())
+
+    sent, done = 0, []
+    for to, group in by_recipient.items():
+        if sent >= EMAIL_SENDS_PER_RUN:
+            break
+        subject, body = _formatDigest([email for task, email in group])
+        try:
+            mail.send_mail(sender, to, subject, body)
+        except Exception:
+            logging.exception('Failed to send %d emails to %s', len(group), to)
+            done.extend(task for task, email in group
+                        if task.retry_count >= EMAIL_MAX_ATTEMPTS)
+            continue
+        sent += 1
+        done.extend(task for task, email in group)
+
+    for start in range(0, len(done), EMAIL_LEASE_TASKS):
+        queue.delete_tasks(done[start:start + EMAIL_LEASE_TASKS])
+
+    backlog = queue.fetch_statistics().tasks
+    memcache.set(EMAIL_BACKLOG_KEY, backlog)
+    logging.info('Sent %d email digests, %d emails still queued',
+                 sent, backlog)
+    return sent, backlog
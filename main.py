@@ -9,10 +9,22 @@ created by wesc on 2014 may 24
 
 __author__ = 'wesc+api@google.com (Wesley Chun)'
 
+import json
+
 import webapp2
 from google.appengine.api import app_identity
 from google.appengine.api import mail
+from google.appengine.api import memcache
+from google.appengine.api import users
 from conference import ConferenceApi
+from cache import LOCAL_CACHE
+from cache import RESPONSE_CACHE_STATS
+from mailer import sendDigests
+from mailer import EMAIL_BACKLOG_KEY
+from metrics import getMetrics
+from metrics import newResetToken
+from metrics import resetMetrics
+from metrics import useResetToken
 
 
 class SetAnnouncementHandler(webapp2.RequestHandler):
@@ -23,7 +35,8 @@ class SetAnnouncementHandler(webapp2.RequestHandler):
 
 class SendConfirmationEmailHandler(webapp2.RequestHandler):
     def post(self):
-        """Send email confirming Conference creation."""
+        """Send an email queued as a push task by earlier versions; emails
+        now go through the mailer's digests."""
         mail.send_mail(
             'noreply@%s.appspotmail.com' % (
                 app_identity.get_application_id()),     # from
@@ -36,13 +49,116 @@ class SendConfirmationEmailHandler(webapp2.RequestHandler):
 
 class SetFeaturedSpeakerHandler(webapp2.RequestHandler):
     def get(self):
-        """Set Featured Speaker in Memcache"""
+        """Set Featured Speakers of a Conference in Memcache"""
         ConferenceApi._cacheFeaturedSpeaker(
-            self.request.get('websafeConferenceKey'),
-            self.request.get('websafeSpeakerKey'))
+            self.request.get('websafeConferenceKey'))
+
+class AppendSpeakerSessionsHandler(webapp2.RequestHandler):
+    def post(self):
+        """Add Sessions stored by a bulk create to their speakers' lists."""
+        ConferenceApi._appendSpeakerSessionsTask(
+            self.request.get_all('sessionKeys'))
+
+class SyncSeatsAvailableHandler(webapp2.RequestHandler):
+    def post(self):
+        """Refresh a Conference's seatsAvailable from its seat shards."""
+        ConferenceApi._syncSeatsAvailable(
+            self.request.get('websafeConferenceKey'))
+
+class ProcessRegistrationsHandler(webapp2.RequestHandler):
+    def get(self):
+        """Apply queued registrations, oldest conference batch first."""
+        ConferenceApi._processRegistrations()
+
+    def post(self):
+        """Apply the queued registrations of a Conference."""
+        ConferenceApi._processRegistrations(
+            self.request.get('websafeConferenceKey') or None)
+
+class UpdateOrganizerNameHandler(webapp2.RequestHandler):
+    def post(self):
+        """Copy an organiser's display name onto their Conferences."""
+        ConferenceApi._updateOrganizerDisplayName(
+            self.request.get('userId'),
+            self.request.get('pageToken') or None)
+
+
+class BackfillOrganizerNamesHandler(webapp2.RequestHandler):
+    def get(self):
+        """Start copying organisers' names onto existing Conferences."""
+        ConferenceApi._backfillOrganizerDisplayNames()
+
+    def post(self):
+        """Continue copying organisers' names onto existing Conferences."""
+        ConferenceApi._backfillOrganizerDisplayNames(
+            self.request.get('pageToken') or None)
+
+class MigrateWishlistsHandler(webapp2.RequestHandler):
+    def get(self):
+        """Start moving Profiles' wishlists into WishlistEntry children."""
+        ConferenceApi._migrateWishlists()
+
+    def post(self):
+        """Continue moving Profiles' wishlists into WishlistEntry children."""
+        ConferenceApi._migrateWishlists(
+            self.request.get('pageToken') or None)
+
+class MigrateRegistrationsHandler(webapp2.RequestHandler):
+    def get(self):
+        """Start moving Profiles' registrations into Registration children.
+        """
+        ConferenceApi._migrateRegistrations()
+
+    def post(self):
+        """Continue moving Profiles' registrations into Registration
+        children."""
+        ConferenceApi._migrateRegistrations(
+            self.request.get('pageToken') or None)
+
+class SendEmailDigestsHandler(webapp2.RequestHandler):
+    def get(self):
+        """Send the queued emails, one digest per recipient."""
+        sendDigests()
+
+class MetricsHandler(webapp2.RequestHandler):
+    def get(self):
+        """Show the endpoints' metrics, and this instance's cache stats,
+        as JSON."""
+        self.response.headers['Content-Type'] = 'application/json'
+        self.response.write(json.dumps({
+            'endpoints': getMetrics(),
+            'instance': {
+                'localCache': LOCAL_CACHE.stats(),
+                'responseCache': RESPONSE_CACHE_STATS,
+            },
+            'emailBacklog': memcache.get(EMAIL_BACKLOG_KEY),
+            # POST it to /admin/metrics/reset to reset the totals
+            'resetToken': newResetToken(users.get_current_user().user_id()),
+        }, indent=2, sort_keys=True))
+
+
+class ResetMetricsHandler(webapp2.RequestHandler):
+    def post(self):
+        """Reset the endpoints' metrics, given the token /admin/metrics
+        issued to this admin."""
+        if not useResetToken(users.get_current_user().user_id(),
+                             self.request.get('token')):
+            self.abort(403)
+        resetMetrics()
 
 app = webapp2.WSGIApplication([
     ('/crons/set_announcement', SetAnnouncementHandler),
+    ('/crons/send_emails', SendEmailDigestsHandler),
+    ('/crons/process_registrations', ProcessRegistrationsHandler),
     ('/tasks/send_confirmation_email', SendConfirmationEmailHandler),
     ('/tasks/set_featured_speaker', SetFeaturedSpeakerHandler),
+    ('/tasks/sync_seats_available', SyncSeatsAvailableHandler),
+    ('/tasks/append_speaker_sessions', AppendSpeakerSessionsHandler),
+    ('/tasks/process_registrations', ProcessRegistrationsHandler),
+    ('/tasks/update_organizer_name', UpdateOrganizerNameHandler),
+    ('/tasks/backfill_organizer_names', BackfillOrganizerNamesHandler),
+    ('/tasks/migrate_wishlists', MigrateWishlistsHandler),
+    ('/tasks/migrate_registrations', MigrateRegistrationsHandler),
+    ('/admin/metrics', MetricsHandler),
+    ('/admin/metrics/reset', ResetMetricsHandler),
 ], debug=True)
\ No newline at end of file
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+
+"""metrics.py
+Conference Central per-endpoint metrics: latency, App Engine API calls
+(datastore, memcache, ...), memcache hits and misses and task enqueues of
+every endpoint method, kept per instance and periodically added to totals
+in memcache.
+"""
+
+import binascii
+import bisect
+import functools
+import os
+import threading
+import time
+
+from google.appengine.api import apiproxy_stub_map
+from google.appengine.api import memcache
+
+# Names the RPC hooks are registered under in the API proxy.
+RPC_HOOK_NAME = 'conference_rpc_count'
+RPC_RESULT_HOOK_NAME = 'conference_rpc_results'
+
+# RPCs issued by the most recent call of each endpoint,
+# {endpoint name: {service name: number of RPCs}}.
+LAST_RPC_COUNTS = {}
+
+# Upper bounds, in milliseconds, of the latency histogram buckets; the
+# last bucket holds every slower call.
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Counters kept for each endpoint method, after the latency buckets.
+COUNTERS = ('calls', 'errors', 'latency_ms', 'datastore_rpcs',
+            'memcache_rpcs', 'memcache_hits', 'memcache_misses', 'tasks')
+
+# Memcache key prefix of the totals, METRICS_<endpoint>_<counter>.
+METRICS_KEY_PREFIX = 'METRICS_'
+
+# Seconds an instance adds up its endpoints' metrics before it adds them
+# to the totals in memcache, with a single RPC.
+METRICS_FLUSH_INTERVAL = 60
+
+# Names of the endpoint methods being measured.
+ENDPOINTS = []
+
+# Whether endpoint calls are measured; off, the decorator only calls through.
+ENABLED = True
+
+# Memcache key of the token an admin must send back to reset the totals,
+# per admin, and the seconds it stays valid.
+RESET_TOKEN_KEY = 'RESET_METRICS_TOKEN_%s'
+RESET_TOKEN_TTL = 600
+
+# The counters of the endpoint running on the current request thread.
+_local = threading.local()
+
+# Metrics of this instance not yet added to memcache, {key: amount}, and
+# when they were last added.
+_pending = {}
+_pending_lock = threading.Lock()
+_last_flush = [time.time()]
+
+
+# Pre-call hook run by the API proxy for every RPC, sync or async.
+def _countRpc(service, call, request, response):
+    counts = getattr(_local, 'rpcs', None)
+    if counts is not None:
+        counts[service] = counts.get(service, 0) + 1
+
+
+# Post-call hook run by the API proxy as each RPC completes; counts the
+# memcache hits and misses and the tasks enqueued.
+def _countRpcResult(service, call, request, response):
+    counts = getattr(_local, 'rpcs', None)
+    if counts is None:
+        return
+    if service == 'memcache' and call == 'Get':
+        hits = response.item_size()
+        counts['memcache_hits'] = counts.get('memcache_hits', 0) + hits
+        counts['memcache_misses'] = (counts.get('memcache_misses', 0) +
+                                     request.key_size() - hits)
+    elif service == 'taskqueue' and call == 'BulkAdd':
+        counts['tasks'] = counts.get('tasks', 0) + request.add_request_size()
+
+
+# Registers the hooks on the current API proxy. Append() is a no-op once a
+# hook is there; calling it each time keeps counting working when the
+# proxy is swapped out (e.g. by a testbed).
+def _installHook():
+    apiproxy = apiproxy_stub_map.apiproxy
+    apiproxy.GetPreCallHooks().Append(RPC_HOOK_NAME, _countRpc)
+    apiproxy.GetPostCallHooks().Append(RPC_RESULT_HOOK_NAME, _countRpcResult)
+
+
+# Memcache key of an endpoint's counter.
+def _metricKey(name, counter):
+    return '%s_%s' % (name, counter)
+
+
+# Names of the latency histogram counters, one per bucket.
+def _bucketCounters():
+    return ['le_%d' % bound for bound in LATENCY_BUCKETS_MS] + ['le_inf']
+
+
+# Adds a finished call to this instance's pending metrics, and the pending
+# metrics to memcache once every METRICS_FLUSH_INTERVAL seconds.
+def _record(name, elapsed_ms, failed, counts, flush=True):
+    bucket = _bucketCounters()[
+        bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)]
+    amounts = {
+        'calls': 1,
+        'errors': int(failed),
+        'latency_ms': int(elapsed_ms),
+        'datastore_rpcs': counts.get('datastore_v3', 0),
+        'memcache_rpcs': counts.get('memcache', 0),
+        'memcache_hits': counts.get('memcache_hits', 0),
+        'memcache_misses': counts.get('memcache_misses', 0),
+        'tasks': counts.get('tasks', 0),
+        bucket: 1,
+    }
+
+    with _pending_lock:
+        for counter, amount in amounts.items():
+            if amount:
+                key = _metricKey(name, counter)
+                _pending[key] = _pending.get(key, 0) + amount
+        if not flush or (
+                time.time() - _last_flush[0] < METRICS_FLUSH_INTERVAL):
+            return
+        totals = dict(_pending)
+        _pending.clear()
+        _last_flush[0] = time.time()
+
+    # outside the lock, and after the endpoint's counters were put away,
+    # so the flush is not counted against the endpoint
+    try:
+        memcache.offset_multi(totals, key_prefix=METRICS_KEY_PREFIX,
+                              initial_value=0)
+    except Exception:
+        # metrics are best effort, never fail a request over them
+        pass
+
+
+# Decorator for endpoint methods recording the latency, RPCs, memcache
+# hits and misses and tasks of each call.
+def recordMetrics(func):
+    ENDPOINTS.append(func.__name__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return func(*args, **kwargs)
+        _installHook()
+        outer = getattr(_local, 'rpcs', None)
+        counts = _local.rpcs = {}
+        failed = True
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed_ms = (time.time() - start) * 1000
+            LAST_RPC_COUNTS[func.__name__] = counts
+            # nested calls also count towards the enclosing endpoint
+            if outer is not None:
+                for service, n in counts.items():
+                    outer[service] = outer.get(service, 0) + n
+            _local.rpcs = outer
+            # nested calls leave the flush to the enclosing endpoint
+            _record(func.__name__, elapsed_ms, failed, counts,
+                    flush=outer is None)
+    return wrapper
+
+
+# Returns the RPCs the last call of an endpoint made to a service.
+def getRpcCount(name, service='datastore_v3'):
+    return LAST_RPC_COUNTS.get(name, {}).get(service, 0)
+
+
+# Returns the totals in memcache of every endpoint that has been called,
+# {endpoint name: {counter: total}}, with the latency histogram under
+# 'latency' as [[bucket, calls], ...]. Metrics instances have not flushed
+# yet (at most METRICS_FLUSH_INTERVAL seconds worth) are not included.
+def getMetrics():
+    buckets = _bucketCounters()
+    keys = [_metricKey(name, counter) for name in ENDPOINTS
+            for counter in COUNTERS + tuple(buckets)]
+    totals = memcache.get_multi(keys, key_prefix=METRICS_KEY_PREFIX)
+
+    metrics = {}
+    for name in ENDPOINTS:
+        calls = totals.get(_metricKey(name, 'calls'), 0)
+        if not calls:
+            continue
+        endpoint = dict((counter, totals.get(_metricKey(name, counter), 0))
+                        for counter in COUNTERS)
+        endpoint['mean_latency_ms'] = endpoint['latency_ms'] // calls
+        endpoint['latency'] = [
+            [bucket, totals.get(_metricKey(name, bucket), 0)]
+            for bucket in buckets]
+        metrics[name] = endpoint
+    return metrics
+
+
+# Returns a new token for an admin to reset the totals with; only a page
+# served to the admin sees it, so other sites can not forge a reset.
+def newResetToken(user_id):
+    token = binascii.hexlify(os.urandom(16))
+    memcache.set(RESET_TOKEN_KEY % user_id, token, time=RESET_TOKEN_TTL)
+    return token
+
+
+# Uses up an admin's reset token; returns whether token was the one issued.
+def useResetToken(user_id, token):
+    key = RESET_TOKEN_KEY % user_id
+    issued = memcache.get(key)
+    if not token or issued != token:
+        return False
+    return memcache.delete(key) == memcache.DELETE_SUCCESSFUL
+
+
+# Drops the totals in memcache, starting a new measurement period.
+def resetMetrics():
+    memcache.delete_multi(
+        [_metricKey(name, counter) for name in ENDPOINTS
+         for counter in COUNTERS + tuple(_bucketCounters())],
+        key_prefix=METRICS_KEY_PREFIX)
@@ -35,6 +35,56 @@ class SpeakerForms(messages.Message):
     items = messages.MessageField(SpeakerForm, 1, repeated=True)
 
 
+class BatchResultForm(messages.Message):
+    """BatchResultForm -- outcome of one item of a bulk create; websafeKey
+    of the created entity, or the error that kept it from being created"""
+    index      = messages.IntegerField(1)
+    websafeKey = messages.StringField(2)
+    error      = messages.StringField(3)
+
+
+class BatchResultForms(messages.Message):
+    """BatchResultForms -- outcome of every item of a bulk create"""
+    items = messages.MessageField(BatchResultForm, 1, repeated=True)
+
+
+class FeaturedSpeaker(ndb.Model):
+    """FeaturedSpeaker -- leaderboard entry of a SpeakerIndex"""
+    speakerKey = ndb.KeyProperty(kind='Speaker')
+    name       = ndb.StringProperty()
+    sessions   = ndb.IntegerProperty()
+
+
+class SpeakerIndex(ndb.Model):
+    """SpeakerIndex -- the Speakers of a Conference, child of the Conference
+    with the fixed id SPEAKER_INDEX_ID"""
+    speakerKeys = ndb.KeyProperty(kind='Speaker', repeated=True,
+                                  indexed=False)
+    featured    = ndb.LocalStructuredProperty(FeaturedSpeaker, repeated=True)
+
+
+class SpeakerSessions(ndb.Model):
+    """SpeakerSessions -- keys of every Session a Speaker gives, across all
+    Conferences, child of the Speaker with the fixed id SPEAKER_SESSIONS_ID;
+    complete is False until the Sessions written before it are merged in"""
+    sessionKeys = ndb.KeyProperty(kind='Session', repeated=True,
+                                  indexed=False)
+    complete    = ndb.BooleanProperty(default=False, indexed=False)
+
+
+SPEAKER_SESSIONS_ID = 'sessions'
+
+
+class SpeakerSessionCount(ndb.Model):
+    """SpeakerSessionCount -- number of Sessions a Speaker gives at a
+    Conference, child of the Conference keyed by the Speaker's id"""
+    speakerKey = ndb.KeyProperty(kind='Speaker', indexed=False)
+    name       = ndb.StringProperty(indexed=False)
+    count      = ndb.IntegerProperty(default=0, indexed=False)
+
+SPEAKER_INDEX_ID = 'speakers'
+
+
 class Session(ndb.Model):
     """Session -- Session object"""
     name          = ndb.StringProperty(required=True)
@@ -48,6 +98,21 @@ class Session(ndb.Model):
     parentKey = ndb.StringProperty(required=True)
 
 
+class SessionSchedule(ndb.Model):
+    """SessionSchedule -- the Sessions of a Conference, with their keys,
+    compressed into chunks that are read in place of a Session query;
+    children of the Conference. The chunk with the fixed id SCHEDULE_ID
+    takes new sessions; once full it hands them to the next of the chunks
+    with ids 1 to full. size is the encoded size of its sessions"""
+    sessions = ndb.LocalStructuredProperty(Session, repeated=True,
+                                           compressed=True, keep_keys=True)
+    full     = ndb.IntegerProperty(default=0, indexed=False)
+    size     = ndb.IntegerProperty(default=0, indexed=False)
+
+
+SCHEDULE_ID = 'schedule'
+
+
 class SessionForm(messages.Message):
     """SessionForm -- Session outbound form message"""
     name          = messages.StringField(1)
@@ -63,7 +128,8 @@ class SessionForm(messages.Message):
 
 class SessionForms(messages.Message):
     """SessionForms -- Multiple Session outbound form message"""
-    items = messages.MessageField(SessionForm, 1, repeated=True)
+    items         = messages.MessageField(SessionForm, 1, repeated=True)
+    nextPageToken = messages.StringField(2)
 
 
 # SessionType enum holder of the values available
@@ -86,10 +152,18 @@ class Profile(ndb.Model):
     displayName            = ndb.StringProperty()
     mainEmail              = ndb.StringProperty()
     teeShirtSize           = ndb.StringProperty(default='NOT_SPECIFIED')
+    # legacy registrations, moved into Registration children by the migration
     conferenceKeysToAttend = ndb.StringProperty(repeated=True)
+    # legacy wishlist, moved into WishlistEntry children by the migration
     sessionWishList        = ndb.StringProperty(repeated=True)
 
 
+class WishlistEntry(ndb.Model):
+    """WishlistEntry -- a Session on a User's wishlist, child of the Profile
+    keyed by the webSafeSessionKey; it has no properties, so the wishlist
+    is read with keys-only queries"""
+
+
 class ProfileMiniForm(messages.Message):
     """ProfileMiniForm -- update Profile form message"""
     displayName  = messages.StringField(1)
@@ -122,6 +196,33 @@ class Conference(ndb.Model):
     maxAttendees    = ndb.IntegerProperty()
     seatsAvailable  = ndb.IntegerProperty()
     endDate         = ndb.DateProperty()
+    seatShards      = ndb.IntegerProperty(default=0, indexed=False)
+    highDemand      = ndb.BooleanProperty(default=False)
+    organizerDisplayName = ndb.StringProperty(indexed=False)
+
+
+class AnnouncedConference(ndb.Model):
+    """AnnouncedConference -- entry of the NearlySoldOut set"""
+    conferenceKey = ndb.KeyProperty(kind='Conference')
+    name          = ndb.StringProperty()
+
+
+class NearlySoldOut(ndb.Model):
+    """NearlySoldOut -- the Conferences with only a few seats left, updated
+    as their seatsAvailable crosses the threshold; a single entity with the
+    fixed id NEARLY_SOLD_OUT_ID"""
+    conferences = ndb.LocalStructuredProperty(AnnouncedConference,
+                                              repeated=True)
+
+
+NEARLY_SOLD_OUT_ID = 'announcement'
+
+
+class SeatShard(ndb.Model):
+    """SeatShard -- one shard of the seats still available at a Conference.
+    Shards are root entities so registrations can write them in parallel;
+    Conference.seatsAvailable is their sum, refreshed by a task."""
+    seats = ndb.IntegerProperty(default=0, indexed=False)
 
 
 class ConferenceForm(messages.Message):
@@ -138,11 +239,75 @@ class ConferenceForm(messages.Message):
     endDate              = messages.StringField(10)  # DateTimeField()
     websafeKey           = messages.StringField(11)
     organizerDisplayName = messages.StringField(12)
+    highDemand           = messages.BooleanField(13)
+
+
+class ConferenceSummaryForm(messages.Message):
+    """ConferenceSummaryForm -- Conference outbound listing message, only
+    the properties read by a projection query"""
+    name           = messages.StringField(1)
+    city           = messages.StringField(2)
+    startDate      = messages.StringField(3)  # DateTimeField()
+    endDate        = messages.StringField(4)  # DateTimeField()
+    maxAttendees   = messages.IntegerField(5)
+    seatsAvailable = messages.IntegerField(6)
+    websafeKey     = messages.StringField(7)
 
 
 class ConferenceForms(messages.Message):
     """ConferenceForms -- multiple Conference outbound form message"""
-    items = messages.MessageField(ConferenceForm, 1, repeated=True)
+    items         = messages.MessageField(ConferenceForm, 1, repeated=True)
+    nextPageToken = messages.StringField(2)
+    summaries     = messages.MessageField(ConferenceSummaryForm, 3,
+                                          repeated=True)
+
+
+class Registration(ndb.Model):
+    """Registration -- a User registered for a Conference, child of the
+    Profile keyed by the websafeConferenceKey; keys-only queries list a
+    user's conferences (by ancestor) and a conference's attendees (by
+    conferenceKey)"""
+    conferenceKey = ndb.KeyProperty(kind='Conference')
+
+
+class RegistrationTicket(ndb.Model):
+    """RegistrationTicket -- a queued registration for a high demand
+    Conference, child of the Profile keyed by the websafeConferenceKey"""
+    conferenceKey = ndb.KeyProperty(kind='Conference', indexed=False)
+    status        = ndb.StringProperty(default='PENDING', indexed=False)
+    message       = ndb.StringProperty(indexed=False)
+    created       = ndb.DateTimeProperty(auto_now_add=True, indexed=False)
+
+
+class RegistrationForm(messages.Message):
+    """RegistrationForm -- outbound registration result message; data is
+    only set once the user holds a seat"""
+    data                 = messages.BooleanField(1)
+    status               = messages.EnumField('RegistrationStatus', 2)
+    websafeTicketKey     = messages.StringField(3)
+    websafeConferenceKey = messages.StringField(4)
+    message              = messages.StringField(5)
+
+
+class AttendeeForm(messages.Message):
+    """AttendeeForm -- outbound attendee of a Conference message"""
+    displayName = messages.StringField(1)
+    mainEmail   = messages.StringField(2)
+
+
+class AttendeeForms(messages.Message):
+    """AttendeeForms -- page of a Conference's attendees outbound message;
+    total counts every attendee"""
+    items         = messages.MessageField(AttendeeForm, 1, repeated=True)
+    nextPageToken = messages.StringField(2)
+    total         = messages.IntegerField(3)
+
+
+class RegistrationStatus(messages.Enum):
+    """RegistrationStatus -- registration ticket status enumeration value"""
+    PENDING    = 1
+    REGISTERED = 2
+    REJECTED   = 3
 
 
 class TeeShirtSize(messages.Enum):
@@ -175,7 +340,10 @@ class ConferenceQueryForms(messages.Message):
     """ConferenceQueryForms --
     multiple ConferenceQueryForm inbound form message
     """
-    filters = messages.MessageField(ConferenceQueryForm, 1, repeated=True)
+    filters   = messages.MessageField(ConferenceQueryForm, 1, repeated=True)
+    pageSize  = messages.IntegerField(2)
+    pageToken = messages.StringField(3)
+    summary   = messages.BooleanField(4)
 
 
 class StringMessage(messages.Message):
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""sessionindex.py
+Conference Central in-memory session filtering. The datastore allows one
+inequality filter per query, so a conference's sessions are loaded once,
+kept sorted on every filterable property, and combinations of ranges are
+answered with binary searches.
+"""
+
+import bisect
+import collections
+
+# Session properties that can be filtered on a range
+RANGE_PROPERTIES = ('startTime', 'duration', 'date')
+
+
+# Sort key of a session in a listing: by day, then by start time.
+def _listingOrder(session):
+    return (session.date is None, session.date,
+            session.startTime is None, session.startTime, session.name)
+
+
+class SessionIndex(object):
+    """SessionIndex -- the sessions of one conference, with a sorted column
+    per range property and the positions of each session type"""
+
+    def __init__(self, sessions):
+        self.sessions = sorted(sessions, key=_listingOrder)
+
+        # {property: ([sorted values], [positions of those values])},
+        # sessions without a value for the property are left out
+        self._columns = {}
+        for name in RANGE_PROPERTIES:
+            pairs = sorted((getattr(session, name), i)
+                           for i, session in enumerate(self.sessions)
+                           if getattr(session, name) is not None)
+            self._columns[name] = ([value for value, i in pairs],
+                                   [i for value, i in pairs])
+
+        # {typeOfSession: set of positions}
+        self._types = collections.defaultdict(set)
+        for i, session in enumerate(self.sessions):
+            self._types[session.typeOfSession].add(i)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def _span(self, name, low, high):
+        """Return the slice of a column with values within [low, high],
+        either bound being None for open."""
+        values = self._columns[name][0]
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        stop = len(values) if high is None else bisect.bisect_right(
+            values, high)
+        return start, max(start, stop)
+
+    def select(self, ranges=None, excludeTypes=()):
+        """Return the sessions matching every range, {property: (low,
+        high)} with inclusive bounds, and not of an excluded type, in
+        listing order."""
+        ranges = dict((name, bounds) for name, bounds in (ranges or {}).items()
+                      if bounds != (None, None))
+        excluded = set()
+        for typeOfSession in excludeTypes:
+            excluded |= self._types.get(typeOfSession, set())
+
+        if not ranges:
+            return [session for i, session in enumerate(self.sessions)
+                    if i not in excluded]
+
+        # walk the narrowest range and check the others on its candidates
+        spans = dict((name, self._span(name, low, high))
+                     for name, (low, high) in ranges.items())
+        narrowest = min(spans, key=lambda name: spans[name][1] -
+                        spans[name][0])
+        start, stop = spans[narrowest]
+        candidates = self._columns[narrowest][1][start:stop]
+
+        # the other ranges as membership checks on the session values
+        checks = [(name, ranges[name]) for name in ranges
+                  if name != narrowest]
+
+        matched = []
+        for i in candidates:
+            if i in excluded:
+                continue
+            session = self.sessions[i]
+            for name, (low, high) in checks:
+                value = getattr(session, name)
+                if (value is None or (low is not None and value < low) or
+                        (high is not None and value > high)):
+                    break
+            else:
+                matched.append(i)
+
+        return [self.sessions[i] for i in sorted(matched)]
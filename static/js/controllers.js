@@ -624,7 +624,11 @@ conferenceApp.controllers.controller('ConferenceDetailCtrl', function ($scope, $
                         return;
                     }
                 } else {
-                    if (resp.result) {
+                    if (resp.result && resp.result.status == 'PENDING') {
+                        // Registration queued for a high demand conference.
+                        $scope.messages = 'Your registration is queued, check back shortly';
+                        $scope.alertStatus = 'info';
+                    } else if (resp.result) {
                         // Register succeeded.
                         $scope.messages = 'Registered for the conference';
                         $scope.alertStatus = 'success';
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""base.py
+Conference Central tests run against the App Engine SDK's local service
+stubs. Run them from the repository root with the SDK importable, e.g.
+    PYTHONPATH=$GAE_SDK python -m unittest discover -s tests -t .
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import dev_appserver
+dev_appserver.fix_sys_path()
+
+from google.appengine.datastore import datastore_stub_util
+from google.appengine.ext import ndb
+from google.appengine.ext import testbed
+
+from cache import LOCAL_CACHE
+from utils import TOKEN_CACHE
+
+
+class AppEngineTestCase(unittest.TestCase):
+    """AppEngineTestCase -- a test with datastore, memcache, task queue,
+    mail and URL fetch stubs, signed in to the API as USER_EMAIL"""
+
+    USER_EMAIL = 'user@example.com'
+
+    def setUp(self):
+        self.testbed = testbed.Testbed()
+        self.testbed.activate()
+        self.testbed.setup_env(
+            ENDPOINTS_AUTH_EMAIL=self.USER_EMAIL,
+            ENDPOINTS_AUTH_DOMAIN='example.com',
+            overwrite=True)
+        # every write is visible to queries at once
+        self.testbed.init_datastore_v3_stub(
+            consistency_policy=datastore_stub_util.
+            PseudoRandomHRConsistencyPolicy(probability=1))
+        self.testbed.init_memcache_stub()
+        # queue.yaml declares the queues
+        self.testbed.init_taskqueue_stub(root_path=ROOT)
+        self.testbed.init_mail_stub()
+        self.testbed.init_urlfetch_stub()
+        self.testbed.init_app_identity_stub()
+        ndb.get_context().clear_cache()
+        # the in-process caches outlive a test
+        LOCAL_CACHE.clear()
+        TOKEN_CACHE.clear()
+
+    def tearDown(self):
+        self.testbed.deactivate()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""test_featured_speaker.py
+The featured speaker task caches the leaderboard of any conference it is
+given: conferences without a SpeakerIndex get one built, and bad or
+missing conferences are logged, not raised.
+"""
+
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.api import memcache
+from google.appengine.ext import ndb
+
+from conference import ConferenceApi
+from conference import MEMCACHE_FEATURED_SPEAKER_KEY
+from models import Conference
+from models import Profile
+from models import Session
+from models import Speaker
+from models import SPEAKER_INDEX_ID
+from models import SpeakerIndex
+
+
+class CacheFeaturedSpeakerTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(CacheFeaturedSpeakerTest, self).setUp()
+        self.c_key = ndb.Key(
+            Conference, 1, parent=ndb.Key(Profile, 'organiser@example.com'))
+
+    def testIndexIsBuiltForOlderConferences(self):
+        spkr_key = Speaker(name='Ada').put()
+        Conference(key=self.c_key, name='Conference').put()
+        ndb.put_multi([Session(parent=self.c_key, name='Session %d' % i,
+                               parentKey=self.c_key.urlsafe(),
+                               speakerKey=[spkr_key.urlsafe()])
+                       for i in range(2)])
+
+        featured = ConferenceApi._cacheFeaturedSpeaker(self.c_key.urlsafe())
+
+        self.assertEqual(featured, 'Featured speakers: Ada (2 sessions)')
+        self.assertEqual(memcache.get(
+            MEMCACHE_FEATURED_SPEAKER_KEY % self.c_key.urlsafe()), featured)
+        self.assertIsNotNone(
+            ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=self.c_key).get())
+
+    def testMissingConferenceIsCachedEmpty(self):
+        self.assertEqual(
+            ConferenceApi._cacheFeaturedSpeaker(self.c_key.urlsafe()), '')
+        self.assertEqual(memcache.get(
+            MEMCACHE_FEATURED_SPEAKER_KEY % self.c_key.urlsafe()), '')
+        self.assertIsNone(
+            ndb.Key(SpeakerIndex, SPEAKER_INDEX_ID, parent=self.c_key).get())
+
+    def testInvalidKeyIsNotRaised(self):
+        self.assertEqual(ConferenceApi._cacheFeaturedSpeaker('not-a-key'), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""test_mailer.py
+Confirmation emails queued on the pull queue go out as one digest per
+recipient, through the local mail stub.
+"""
+
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.ext import testbed
+
+from mailer import EMAIL_QUEUE
+from mailer import queueEmail
+from mailer import sendDigests
+from utils import TaskBatch
+
+
+class SendDigestsTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(SendDigestsTest, self).setUp()
+        self.mail = self.testbed.get_stub(testbed.MAIL_SERVICE_NAME)
+        self.queue = self.testbed.get_stub(testbed.TASKQUEUE_SERVICE_NAME)
+
+    def queueEmails(self, emails):
+        tasks = TaskBatch()
+        for to, subject in emails:
+            queueEmail(tasks, to, subject, 'Body of %s' % subject, 'info')
+        tasks.flush()
+
+    def testOneDigestPerRecipient(self):
+        self.queueEmails([('organiser@example.com', 'Session %d' % i)
+                          for i in range(5)])
+        self.assertEqual(sendDigests(), (1, 0))
+
+        sent = self.mail.get_sent_messages()
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sent[0].to, 'organiser@example.com')
+        self.assertEqual(sent[0].subject,
+                         'You have 5 updates from Conference Central')
+        body = sent[0].body.decode()
+        for i in range(5):
+            self.assertIn('Session %d' % i, body)
+
+        # every email that went out is deleted from the queue
+        self.assertEqual(
+            self.queue.get_filtered_tasks(queue_names=[EMAIL_QUEUE]), [])
+
+    def testRecipientsGetTheirOwnDigest(self):
+        self.queueEmails([('a@example.com', 'First'),
+                          ('b@example.com', 'Second'),
+                          ('a@example.com', 'Third')])
+        self.assertEqual(sendDigests(), (2, 0))
+
+        self.assertEqual(
+            len(self.mail.get_sent_messages(to='a@example.com')), 1)
+        only = self.mail.get_sent_messages(to='b@example.com')
+        self.assertEqual(len(only), 1)
+        # a single email keeps its own subject
+        self.assertEqual(only[0].subject, 'Second')
+
+    def testNothingQueuedSendsNothing(self):
+        self.assertEqual(sendDigests(), (0, 0))
+        self.assertEqual(self.mail.get_sent_messages(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
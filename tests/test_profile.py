@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+"""test_profile.py
+A ProfileForm lists the user's wishlist from the Profile's WishlistEntry
+children, with any sessions on the legacy list not yet migrated.
+"""
+
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.ext import ndb
+
+from conference import ConferenceApi
+from models import Profile
+from models import WishlistEntry
+
+
+class ProfileFormTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(ProfileFormTest, self).setUp()
+        self.api = ConferenceApi()
+        self.p_key = ndb.Key(Profile, self.USER_EMAIL)
+
+    def testWishlistIsReadFromEntries(self):
+        prof = Profile(key=self.p_key, displayName='User',
+                       mainEmail=self.USER_EMAIL)
+        prof.put()
+        ndb.put_multi([WishlistEntry(id=wssk, parent=self.p_key)
+                       for wssk in ('session-1', 'session-2')])
+
+        form = self.api._copyProfileToForm(prof)
+        self.assertEqual(sorted(form.sessionWishList),
+                         ['session-1', 'session-2'])
+
+    def testUnmigratedSessionsAreListed(self):
+        prof = Profile(key=self.p_key, displayName='User',
+                       mainEmail=self.USER_EMAIL,
+                       sessionWishList=['session-1', 'session-2'])
+        prof.put()
+        WishlistEntry(id='session-1', parent=self.p_key).put()
+
+        form = self.api._copyProfileToForm(prof)
+        self.assertEqual(sorted(form.sessionWishList),
+                         ['session-1', 'session-2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
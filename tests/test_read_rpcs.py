@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""test_read_rpcs.py
+The read endpoints overlap their datastore lookups: the number of datastore
+round trips each call makes, as metrics.getRpcCount reports it, does not
+grow with the entities read.
+"""
+
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.ext import ndb
+from protorpc import message_types
+
+from conference import ConferenceApi
+from conference import CONF_GET_REQUEST
+from metrics import getRpcCount
+from models import Conference
+from models import Profile
+
+
+class ReadRpcsTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(ReadRpcsTest, self).setUp()
+        # count the round trips to the datastore itself
+        ndb.get_context().set_cache_policy(False)
+        ndb.get_context().set_memcache_policy(False)
+        self.api = ConferenceApi()
+        self.p_key = ndb.Key(Profile, self.USER_EMAIL)
+        Profile(key=self.p_key, displayName='User',
+                mainEmail=self.USER_EMAIL).put()
+
+    def putConferences(self, first, count, registered=False):
+        """Store count conferences, with ids from first, registering the
+        user for them when asked."""
+        organiser = ndb.Key(Profile, 'organiser@example.com')
+        c_keys = [ndb.Key(Conference, first + i, parent=organiser)
+                  for i in range(count)]
+        entities = [Conference(key=c_key, name='Conference %d' % c_key.id(),
+                               organizerUserId=organiser.id(),
+                               organizerDisplayName='Organiser',
+                               maxAttendees=10, seatsAvailable=10)
+                    for c_key in c_keys]
+        if registered:
+            entities.extend(ConferenceApi._newRegistration(self.p_key, c_key)
+                            for c_key in c_keys)
+        ndb.put_multi(entities)
+        return c_keys
+
+    def getConference(self, c_key):
+        return self.api.getConference(CONF_GET_REQUEST.combined_message_class(
+            websafeConferenceKey=c_key.urlsafe()))
+
+    def testGetConferenceIsOneGet(self):
+        c_key, = self.putConferences(1, 1)
+        form = self.getConference(c_key)
+        self.assertEqual(form.name, 'Conference 1')
+        self.assertEqual(getRpcCount('getConference'), 1)
+
+    def testGetConferenceIsCached(self):
+        c_key, = self.putConferences(1, 1)
+        self.getConference(c_key)
+        self.getConference(c_key)
+        self.assertEqual(getRpcCount('getConference'), 0)
+
+    def testConferencesToAttendRoundTripsDoNotGrow(self):
+        # the Profile, the Registration query and one batch get
+        self.putConferences(1, 1, registered=True)
+        forms = self.api.getConferencesToAttend(message_types.VoidMessage())
+        self.assertEqual(len(forms.items), 1)
+        self.assertEqual(getRpcCount('getConferencesToAttend'), 3)
+
+        self.putConferences(2, 9, registered=True)
+        forms = self.api.getConferencesToAttend(message_types.VoidMessage())
+        self.assertEqual(len(forms.items), 10)
+        self.assertEqual(getRpcCount('getConferencesToAttend'), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""test_registrations.py
+Queued registrations are applied once per ticket, however many times the
+ticket appears in a leased chunk.
+"""
+
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.ext import ndb
+
+from conference import ConferenceApi
+from models import Conference
+from models import Profile
+from models import Registration
+from models import RegistrationStatus
+from models import RegistrationTicket
+
+
+class ApplyRegistrationsTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(ApplyRegistrationsTest, self).setUp()
+        self.c_key = ndb.Key(
+            Conference, 1, parent=ndb.Key(Profile, 'organiser@example.com'))
+        self.shard_keys = ConferenceApi._seatShardKeys(self.c_key, 2)
+        ndb.put_multi(
+            [Conference(key=self.c_key, name='Conference', maxAttendees=10,
+                        seatsAvailable=10, seatShards=2)] +
+            ConferenceApi._newSeatShards(self.c_key, 2, 10))
+
+    def putTicket(self, email):
+        p_key = Profile(key=ndb.Key(Profile, email), mainEmail=email).put()
+        return RegistrationTicket(
+            key=ndb.Key(RegistrationTicket, self.c_key.urlsafe(),
+                        parent=p_key),
+            conferenceKey=self.c_key).put()
+
+    def seatsLeft(self):
+        return sum(shard.seats for shard in ndb.get_multi(self.shard_keys))
+
+    def testDuplicateTicketsTakeOneSeat(self):
+        first = self.putTicket('a@example.com')
+        second = self.putTicket('b@example.com')
+
+        left = ConferenceApi._applyRegistrations(
+            [first, second, first, first], self.shard_keys)
+
+        self.assertEqual(left, [])
+        self.assertEqual(self.seatsLeft(), 8)
+        self.assertEqual(Registration.query().count(), 2)
+        for ticket in ndb.get_multi([first, second]):
+            self.assertEqual(ticket.status,
+                             str(RegistrationStatus.REGISTERED))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""test_session_schedule.py
+A Conference's SessionSchedule is split into chunks: adding sessions
+rewrites only the open chunk, and no chunk grows past the datastore's
+1MB entity limit.
+"""
+
+import binascii
+import os
+import unittest
+
+from tests.base import AppEngineTestCase
+
+from google.appengine.ext import ndb
+
+from conference import ConferenceApi
+from conference import SCHEDULE_CHUNK_BYTES
+from conference import SCHEDULE_CHUNK_SIZE
+from models import Conference
+from models import Profile
+from models import SCHEDULE_ID
+from models import Session
+from models import SessionSchedule
+
+# the datastore's limit on the encoded size of an entity
+MAX_ENTITY_BYTES = 1048572
+
+
+class SessionScheduleTest(AppEngineTestCase):
+
+    def setUp(self):
+        super(SessionScheduleTest, self).setUp()
+        self.api = ConferenceApi()
+        self.c_key = Conference(
+            key=ndb.Key(Conference, 1,
+                        parent=ndb.Key(Profile, 'organiser@example.com')),
+            name='Conference', maxAttendees=10, seatsAvailable=10).put()
+
+    def sessions(self, first, count, **data):
+        """Return count unsaved Sessions of the conference, from first."""
+        s_keys = [ndb.Key(Session, first + i, parent=self.c_key)
+                  for i in range(count)]
+        return [Session(key=s_key, name='Session %d' % s_key.id(),
+                        parentKey=self.c_key.urlsafe(), **data)
+                for s_key in s_keys]
+
+    def schedule(self):
+        return ndb.Key(SessionSchedule, SCHEDULE_ID, parent=self.c_key).get()
+
+    def testFullChunksAreHandedOn(self):
+        # two full chunks, one session in the open one
+        total = 2 * SCHEDULE_CHUNK_SIZE + 1
+        for first in range(1, total + 1, 50):
+            self.api._putSessionObjects(
+                self.c_key, self.sessions(first, min(50, total + 1 - first)),
+                {})
+
+        schedule = self.schedule()
+        self.assertEqual(schedule.full, 2)
+        self.assertEqual(len(schedule.sessions), 1)
+        for i in (1, 2):
+            chunk = ndb.Key(SessionSchedule, i, parent=self.c_key).get()
+            self.assertEqual(len(chunk.sessions), SCHEDULE_CHUNK_SIZE)
+
+        self.assertEqual(
+            [sess.name for sess in self.api._conferenceSchedule(self.c_key)],
+            ['Session %d' % i for i in range(1, total + 1)])
+
+    def testInsertWritesOnlyTheOpenChunk(self):
+        self.api._putSessionObjects(
+            self.c_key, self.sessions(1, SCHEDULE_CHUNK_SIZE + 1), {})
+        full = ndb.Key(SessionSchedule, 1, parent=self.c_key).get()
+
+        self.api._putSessionObjects(
+            self.c_key, self.sessions(SCHEDULE_CHUNK_SIZE + 2, 1), {})
+        self.assertEqual(self.schedule().full, 1)
+        self.assertEqual(len(self.schedule().sessions), 2)
+        self.assertEqual(
+            ndb.Key(SessionSchedule, 1, parent=self.c_key).get(), full)
+
+    def testChunksStayUnderTheEntityLimit(self):
+        # sessions of about 70KB each, that barely compress, fill a chunk
+        # by size long before SCHEDULE_CHUNK_SIZE
+        sessions = self.sessions(
+            1, 30, highlights=binascii.hexlify(os.urandom(700)),
+            speakerKey=[binascii.hexlify(os.urandom(700))
+                        for i in range(50)])
+        schedule = SessionSchedule(
+            key=ndb.Key(SessionSchedule, SCHEDULE_ID, parent=self.c_key))
+        chunks = ConferenceApi._scheduleSessions(schedule, sessions)
+
+        self.assertGreaterEqual(len(chunks), 2)
+        for chunk in chunks + [schedule]:
+            self.assertLessEqual(chunk.size, SCHEDULE_CHUNK_BYTES)
+            self.assertLess(len(chunk._to_pb().Encode()), MAX_ENTITY_BYTES)
+
+        # the datastore takes them, and they read back in order
+        ndb.put_multi(chunks + [schedule])
+        self.assertEqual(
+            [sess.name for sess in self.api._conferenceSchedule(self.c_key)],
+            [sess.name for sess in sessions])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""test_tokeninfo.py
+OAuth token verification against a local stand-in for the tokeninfo
+service, served over HTTP by a thread of the test.
+"""
+
+import BaseHTTPServer
+import json
+import threading
+import time
+import unittest
+import urlparse
+
+from tests.base import AppEngineTestCase
+
+import utils
+from utils import getUserId
+from utils import TOKEN_CACHE
+from utils import TOKEN_CACHE_TTL
+
+
+class TokenInfoHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """TokenInfoHandler -- answers tokeninfo requests with the canned
+    replies, {(token type, token): (status, body)}, and records them"""
+
+    replies = {}
+    requests = []
+
+    def do_GET(self):
+        query = urlparse.parse_qs(urlparse.urlparse(self.path).query)
+        token_type, token = list(query.items())[0]
+        self.requests.append((token_type, token[0]))
+        status, body = self.replies.get(
+            (token_type, token[0]), (400, '{"error": "invalid_token"}'))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TokenInfoTest(AppEngineTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = BaseHTTPServer.HTTPServer(
+            ('localhost', 0), TokenInfoHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        super(TokenInfoTest, self).setUp()
+        self.url, utils.TOKENINFO_URL = utils.TOKENINFO_URL, (
+            'http://localhost:%d/tokeninfo' % self.server.server_port)
+        TokenInfoHandler.replies = {}
+        TokenInfoHandler.requests = []
+
+    def tearDown(self):
+        utils.TOKENINFO_URL = self.url
+        super(TokenInfoTest, self).tearDown()
+
+    def reply(self, token, user_id, expires_in, token_type='id_token'):
+        TokenInfoHandler.replies[(token_type, token)] = (200, json.dumps(
+            {'user_id': user_id, 'expires_in': expires_in}))
+
+    def verify(self, token):
+        self.testbed.setup_env(
+            HTTP_AUTHORIZATION='Bearer %s' % token, overwrite=True)
+        return getUserId(None, id_type='oauth')
+
+    def cachedFor(self, token):
+        """Return the seconds the instance cache keeps a token's user id."""
+        key = utils.TOKEN_USER_KEY % utils.hashlib.sha256(token).hexdigest()
+        return TOKEN_CACHE._items[key][1] - time.time()
+
+    def testVerifiedTokenIsCached(self):
+        self.reply('token', 'user-1', 3600)
+        self.assertEqual(self.verify('token'), 'user-1')
+        self.assertEqual(self.verify('token'), 'user-1')
+        self.assertEqual(len(TokenInfoHandler.requests), 1)
+        # another instance finds it in memcache
+        TOKEN_CACHE.clear()
+        self.assertEqual(self.verify('token'), 'user-1')
+        self.assertEqual(len(TokenInfoHandler.requests), 1)
+
+    def testTtlIsCappedByExpiry(self):
+        self.reply('short', 'user-1', 10)
+        self.reply('long', 'user-2', TOKEN_CACHE_TTL * 10)
+        self.verify('short')
+        self.verify('long')
+        self.assertLessEqual(self.cachedFor('short'), 10)
+        self.assertLessEqual(self.cachedFor('long'), TOKEN_CACHE_TTL)
+        self.assertGreater(self.cachedFor('long'), 10)
+
+    def testExpiredTokenIsNotCached(self):
+        self.reply('expired', 'user-1', 0)
+        self.assertEqual(self.verify('expired'), 'user-1')
+        self.assertEqual(self.verify('expired'), 'user-1')
+        self.assertEqual(len(TokenInfoHandler.requests), 2)
+
+    def testIdTokenFallsBackToAccessToken(self):
+        self.reply('access', 'user-1', 3600, token_type='access_token')
+        self.assertEqual(self.verify('access'), 'user-1')
+        self.assertEqual(TokenInfoHandler.requests,
+                         [('id_token', 'access'), ('access_token', 'access')])
+
+    def testFailuresAreRetriedAndNotCached(self):
+        TokenInfoHandler.replies[('id_token', 'down')] = (503, '{}')
+        self.assertEqual(self.verify('down'), '')
+        self.assertEqual(len(TokenInfoHandler.requests),
+                         utils.TOKEN_VERIFY_ATTEMPTS)
+        self.assertEqual(self.verify('down'), '')
+        self.assertEqual(len(TokenInfoHandler.requests),
+                         2 * utils.TOKEN_VERIFY_ATTEMPTS)
+
+    def testInvalidTokenIsNotRetried(self):
+        self.assertEqual(self.verify('invalid'), '')
+        self.assertEqual(TokenInfoHandler.requests,
+                         [('id_token', 'invalid'), ('access_token', 'invalid')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,21 @@
+import hashlib
 import json
 import os
+import random
 import time
 import uuid
 
 import endpoints
+from google.appengine.api import memcache
+from google.appengine.api import taskqueue
 from google.appengine.api import urlfetch
+from google.appengine.datastore.datastore_query import Cursor
+from google.appengine.ext import ndb
 from models import Profile
+from cache import LruCache
+
+# Upper bound on the number of entities returned in a single page.
+MAX_PAGE_SIZE = 100
 
 # Gets a users email or attempts to authenticate. 
 def getUserId(user, id_type="email"):
@@ -14,28 +24,7 @@ def getUserId(user, id_type="email"):
         return user.email()
 
     if id_type == "oauth":
-        """A workaround implementation for getting userid."""
-        auth = os.getenv('HTTP_AUTHORIZATION')
-        bearer, token = auth.split()
-        token_type = 'id_token'
-        if 'OAUTH_USER_ID' in os.environ:
-            token_type = 'access_token'
-        url = ('https://www.googleapis.com/oauth2/v1/tokeninfo?%s=%s'
-               % (token_type, token))
-        user = {}
-        wait = 1
-        for i in range(3):
-            resp = urlfetch.fetch(url)
-            if resp.status_code == 200:
-                user = json.loads(resp.content)
-                break
-            elif resp.status_code == 400 and 'invalid_token' in resp.content:
-                url = ('https://www.googleapis.com/oauth2/v1/tokeninfo?%s=%s'
-                       % ('access_token', token))
-            else:
-                time.sleep(wait)
-                wait = wait + i
-        return user.get('user_id', '')
+        return getUserIdAsync(user, id_type).get_result()
 
     if id_type == "custom":
         # implement your own user_id creation and getting algorythm
@@ -48,6 +37,118 @@ def getUserId(user, id_type="email"):
             return str(uuid.uuid1().get_hex())
 
 
+# Tasklet version of getUserId; with the oauth id_type, tasklets yielding
+# it keep running while tokeninfo verifies the token.
+@ndb.tasklet
+def getUserIdAsync(user, id_type="email"):
+
+    if id_type != "oauth":
+        raise ndb.Return(getUserId(user, id_type))
+
+    """A workaround implementation for getting userid."""
+    auth = os.getenv('HTTP_AUTHORIZATION')
+    bearer, token = auth.split()
+    token_type = 'id_token'
+    if 'OAUTH_USER_ID' in os.environ:
+        token_type = 'access_token'
+    user_id = yield _tokenUserIdAsync(token, token_type)
+    raise ndb.Return(user_id)
+
+
+# - - - OAuth token verification - - - - - - - - - - - - - - - - - - - - - -
+
+# Endpoint verifying OAuth tokens; TOKENINFO_URL points it at a local
+# stand-in (e.g. under dev_appserver)
+TOKENINFO_URL = os.environ.get(
+    'TOKENINFO_URL', 'https://www.googleapis.com/oauth2/v1/tokeninfo')
+
+# Memcache key of the user id a token (by its SHA-256) was verified for
+TOKEN_USER_KEY = 'TOKEN_USER_%s'
+
+# Most seconds a verified token is trusted without asking tokeninfo again;
+# never longer than the token has left to live
+TOKEN_CACHE_TTL = 300
+
+# Seconds, all attempts included, a request waits on tokeninfo
+TOKEN_VERIFY_DEADLINE = 5
+
+# Most calls made to tokeninfo to verify one token
+TOKEN_VERIFY_ATTEMPTS = 3
+
+# Seconds waited, at most and jittered, before retrying a failed call;
+# doubled for each further retry
+TOKEN_RETRY_DELAY = 0.2
+
+# Verified tokens of this instance, in front of memcache
+TOKEN_CACHE = LruCache(ttl=TOKEN_CACHE_TTL)
+
+
+# Tasklet returning the user id an OAuth token belongs to, or '' when it
+# can not be verified. Verified tokens are cached in process and in
+# memcache until they expire (TOKEN_CACHE_TTL at most), so tokeninfo is
+# called once per token rather than once per request.
+@ndb.tasklet
+def _tokenUserIdAsync(token, token_type='id_token'):
+    ctx = ndb.get_context()
+    key = TOKEN_USER_KEY % hashlib.sha256(token).hexdigest()
+
+    user_id = TOKEN_CACHE.get(key)
+    if user_id is None:
+        user_id = yield ctx.memcache_get(key)
+        if user_id is not None:
+            TOKEN_CACHE.set(key, user_id)
+    if user_id is not None:
+        raise ndb.Return(user_id)
+
+    user = yield _fetchTokenInfoAsync(token, token_type)
+    user_id = user.get('user_id', '')
+
+    # failures are not cached, the next request verifies again
+    ttl = min(TOKEN_CACHE_TTL, int(user.get('expires_in') or 0))
+    if user_id and ttl > 0:
+        TOKEN_CACHE.set(key, user_id, ttl)
+        yield ctx.memcache_set(key, user_id, time=ttl)
+    raise ndb.Return(user_id)
+
+
+# Tasklet asking tokeninfo about a token; returns its JSON reply, or {}
+# when the token is invalid or tokeninfo can not be reached. Failed calls
+# are retried after a short jittered ndb.sleep, which leaves the thread to
+# other tasklets, as long as TOKEN_VERIFY_DEADLINE allows.
+@ndb.tasklet
+def _fetchTokenInfoAsync(token, token_type):
+    ctx = ndb.get_context()
+    give_up = time.time() + TOKEN_VERIFY_DEADLINE
+    delay = TOKEN_RETRY_DELAY
+    for i in range(TOKEN_VERIFY_ATTEMPTS):
+        url = '%s?%s=%s' % (TOKENINFO_URL, token_type, token)
+        try:
+            resp = yield ctx.urlfetch(
+                url, deadline=max(give_up - time.time(), 0.1))
+        except urlfetch.Error:
+            resp = None
+        if resp is not None and resp.status_code == 200:
+            raise ndb.Return(json.loads(resp.content))
+        elif (resp is not None and resp.status_code == 400 and
+              'invalid_token' in resp.content):
+            # not an id token; an access token is the only other kind
+            if token_type == 'access_token':
+                break
+            token_type = 'access_token'
+            continue
+        elif resp is not None and resp.status_code < 500:
+            # tokeninfo answered, retrying will not change its mind
+            break
+        # unreachable or failing; back off unless the budget runs out
+        wait = random.uniform(0, delay)
+        if (i == TOKEN_VERIFY_ATTEMPTS - 1 or
+                time.time() + wait >= give_up):
+            break
+        yield ndb.sleep(wait)
+        delay *= 2
+    raise ndb.Return({})
+
+
 # Gets the user by invoking get_current_user()(GAE) and a user object is 
 # returned if found, or an unauthorized exception is raised.
 def getUser():
@@ -97,4 +198,83 @@ def checkObj(object, name):
         if not object:
             raise endpoints.NotFoundException(
                 'No ' + name + ' found with the key provided.'
-                 )
\ No newline at end of file
+                 )
+
+# Fetches a single page of a query starting at the opaque pageToken.
+# Returns the results and the token of the next page (None when exhausted).
+@ndb.tasklet
+def fetchPageAsync(query, pageSize, pageToken=None, **kwargs):
+    if pageSize <= 0:
+        raise endpoints.BadRequestException(
+            'pageSize must be a positive number. (Error 400)')
+    try:
+        cursor = Cursor(urlsafe=pageToken) if pageToken else None
+    except Exception:
+        raise endpoints.BadRequestException(
+            'The pageToken given is invalid. (Error 400)')
+    results, next_cursor, more = yield query.fetch_page_async(
+        min(pageSize, MAX_PAGE_SIZE), start_cursor=cursor, **kwargs)
+    nextPageToken = next_cursor.urlsafe() if more and next_cursor else None
+    raise ndb.Return(results, nextPageToken)
+
+
+def fetchPage(query, pageSize, pageToken=None, **kwargs):
+    return fetchPageAsync(query, pageSize, pageToken, **kwargs).get_result()
+
+
+# Adds a named task at most once per window of the given seconds. The task
+# runs when the window closes, so it covers everything that asked for it
+# during the window.
+def addTaskOncePerWindow(name, window, **kwargs):
+    slot = int(time.time() // window)
+    try:
+        taskqueue.add(
+            name='%s-%d' % (name, slot),
+            countdown=(slot + 1) * window - time.time(),
+            **kwargs)
+    except (taskqueue.TaskAlreadyExistsError, taskqueue.TombstonedTaskError):
+        pass
+
+
+# Most tasks the task queue accepts in a single add RPC.
+MAX_TASKS_PER_ADD = 100
+
+
+# Collects the tasks of a request so they are added to their queues in one
+# batch per queue: flushAsync() starts the add RPCs, so they can overlap
+# with datastore writes, and wait() finishes them. Tasks that must only run
+# if a transaction commits are added with flush(transactional=True) inside
+# it (at most 5 per transaction), from a batch made inside the
+# transactional function so that a retried attempt starts afresh.
+class TaskBatch(object):
+    def __init__(self, queue_name='default'):
+        self.queue_name = queue_name
+        self.tasks = {}
+        self._rpcs = []
+
+    def add(self, queue_name=None, **kwargs):
+        self.tasks.setdefault(queue_name or self.queue_name, []).append(
+            taskqueue.Task(**kwargs))
+
+    def flushAsync(self):
+        tasks, self.tasks = self.tasks, {}
+        for queue_name, queued in tasks.items():
+            queue = taskqueue.Queue(queue_name)
+            for start in range(0, len(queued), MAX_TASKS_PER_ADD):
+                self._rpcs.append(queue.add_async(
+                    queued[start:start + MAX_TASKS_PER_ADD]))
+        return self
+
+    def wait(self):
+        rpcs, self._rpcs = self._rpcs, []
+        for rpc in rpcs:
+            rpc.get_result()
+
+    def flush(self, transactional=False):
+        if transactional:
+            tasks, self.tasks = self.tasks, {}
+            for queue_name, queued in tasks.items():
+                taskqueue.Queue(queue_name).add(queued, transactional=True)
+        else:
+            self.flushAsync()
+        self.wait()